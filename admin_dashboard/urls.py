@@ -6,5 +6,6 @@ app_name = "admin_dashboard"
 
 urlpatterns = [
     path("", views.dashboard_view, name="dashboard"),
+    path("export/", views.export_view, name="export"),
     path("access-denied/", views.access_denied_view, name="access_denied"),
 ]
@@ -1,8 +1,13 @@
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import Http404
 from django.shortcuts import redirect, render
+from django.utils import timezone
 
+from apps.core.cache import get_or_compute
+from apps.core.streaming import streaming_response
+from blog.exporter import EXPORT_FORMATS, EXPORT_TYPES, export_stream
 from blog.models import Post
 from portfolio.models import Project
 
@@ -23,21 +28,49 @@ def admin_required(view_func):
     return wrapper
 
 
-@admin_required
-def dashboard_view(request):
-    """Main admin dashboard with overview stats"""
-    context = {
+def _dashboard_stats():
+    return {
         "total_posts": Post.objects.count(),
         "published_posts": Post.objects.filter(published=True).count(),
         "draft_posts": Post.objects.filter(published=False).count(),
         "total_projects": Project.objects.count(),
         "featured_projects": Project.objects.filter(featured=True).count(),
+    }
+
+
+@admin_required
+def dashboard_view(request):
+    """Main admin dashboard with overview stats"""
+    context = {
+        **get_or_compute("dashboard:stats", _dashboard_stats, ttl=60),
         "recent_posts": Post.objects.order_by("-created_at")[:5],
         "recent_projects": Project.objects.order_by("-created_at")[:5],
     }
     return render(request, "admin_dashboard/dashboard.html", context)
 
 
+@admin_required
+def export_view(request):
+    """Stream all content as NDJSON or CSV, optionally gzipped"""
+    fmt = request.GET.get("format", "ndjson")
+    content_type = request.GET.get("type", "all")
+    compress = request.GET.get("gzip") == "1"
+    if fmt not in EXPORT_FORMATS or content_type not in EXPORT_TYPES:
+        raise Http404("Unknown export format or type")
+
+    filename = f"export-{content_type}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if compress:
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    response = streaming_response(
+        request, export_stream(fmt, content_type, compress), content_type=mimetype
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 def access_denied_view(request):
     """View for when user doesn't have admin access"""
     return render(request, "admin_dashboard/access_denied.html")
@@ -0,0 +1,239 @@
+"""Front-end assets built ahead of deployment (see the build_assets command).
+
+The stylesheet is compiled by the standalone Tailwind CLI, so no Node
+toolchain is needed, and only contains the utilities the templates use,
+minified. htmx is fetched at a pinned version. Both are written to
+``static/dist/``; collectstatic then fingerprints them with a content hash
+(``CompressedManifestStaticFilesStorage``) and WhiteNoise serves the hashed
+names with a far-future ``immutable`` Cache-Control.
+
+Every download must match the SHA-256 digest pinned for it in
+``assets/SHA256SUMS``: it is checked before the file is moved into
+``.cache/assets/`` and again before the cached copy is run or copied, so a
+tampered release or cache is refused. ``build_assets --pin`` records the
+digests after a version bump; review the diff before committing it. Cached
+downloads make rebuilding work offline. Set ``TAILWIND_CLI`` to use a
+Tailwind binary from elsewhere (it is not checked).
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import stat
+import subprocess
+import urllib.request
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+TAILWIND_VERSION = "3.4.4"
+HTMX_VERSION = "1.9.12"
+
+TAILWIND_URL = (
+    "https://github.com/tailwindlabs/tailwindcss/releases/download/"
+    "v{version}/tailwindcss-{target}"
+)
+HTMX_URL = "https://unpkg.com/htmx.org@{version}/dist/htmx.min.js"
+
+# (system, machine) -> name of the Tailwind release binary
+TAILWIND_TARGETS = {
+    ("Linux", "x86_64"): "linux-x64",
+    ("Linux", "aarch64"): "linux-arm64",
+    ("Darwin", "x86_64"): "macos-x64",
+    ("Darwin", "arm64"): "macos-arm64",
+    ("Windows", "AMD64"): "windows-x64.exe",
+}
+
+DOWNLOAD_TIMEOUT = 60
+
+STYLESHEET = "dist/site.css"
+HTMX = "dist/htmx.min.js"
+
+
+class AssetBuildError(Exception):
+    pass
+
+
+def output_dir():
+    return settings.BASE_DIR / "static"
+
+
+def cache_dir():
+    return settings.BASE_DIR / ".cache" / "assets"
+
+
+def checksums_file():
+    return settings.BASE_DIR / "assets" / "SHA256SUMS"
+
+
+def pinned_digests():
+    """File name -> pinned SHA-256, read from ``SHA256SUMS``"""
+    try:
+        lines = checksums_file().read_text().splitlines()
+    except FileNotFoundError:
+        return {}
+    digests = {}
+    for line in lines:
+        if line.strip() and not line.startswith("#"):
+            digest, name = line.split(maxsplit=1)
+            digests[name.lstrip("*")] = digest.lower()
+    return digests
+
+
+def sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def verify(path, name=None):
+    """Raise unless ``path`` matches the digest pinned for ``name``"""
+    name = name or path.name
+    expected = pinned_digests().get(name)
+    if expected is None:
+        raise AssetBuildError(
+            f"No SHA-256 pinned for {name} in {checksums_file()}; "
+            "run build_assets --pin and review the result"
+        )
+    if (actual := sha256(path)) != expected:
+        raise AssetBuildError(
+            f"SHA-256 mismatch for {name}: expected {expected}, got {actual}"
+        )
+    return path
+
+
+def download(url, path, check=True):
+    """Fetch ``url`` to ``path``, leaving nothing behind on failure.
+
+    With ``check``, the download must match its pinned digest before it
+    replaces ``path``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".part")
+    try:
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+            with open(partial, "wb") as f:
+                shutil.copyfileobj(response, f)
+        if check:
+            verify(partial, path.name)
+    except OSError as e:
+        partial.unlink(missing_ok=True)
+        raise AssetBuildError(f"Could not download {url}: {e}")
+    except AssetBuildError:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, path)
+    return path
+
+
+def tailwind_name(target):
+    return f"tailwindcss-{TAILWIND_VERSION}-{target}"
+
+
+def htmx_name():
+    return f"htmx-{HTMX_VERSION}.min.js"
+
+
+def pinned_downloads():
+    """File name -> URL of everything ``SHA256SUMS`` should cover"""
+    downloads = {
+        tailwind_name(target): TAILWIND_URL.format(
+            version=TAILWIND_VERSION, target=target
+        )
+        for target in TAILWIND_TARGETS.values()
+    }
+    downloads[htmx_name()] = HTMX_URL.format(version=HTMX_VERSION)
+    return downloads
+
+
+def is_pinned():
+    """Whether ``SHA256SUMS`` has a digest for every pinned download"""
+    pinned = pinned_digests()
+    return all(name in pinned for name in pinned_downloads())
+
+
+def is_built():
+    """Whether the static files finders see every built asset"""
+    return all(finders.find(name) for name in (STYLESHEET, HTMX))
+
+
+def pin():
+    """Download every pinned file and rewrite ``SHA256SUMS`` with their
+    digests; returns the file names"""
+    lines = [
+        "# SHA-256 of the front-end downloads in apps/core/assets.py,",
+        "# written by `manage.py build_assets --pin`",
+    ]
+    for name, url in pinned_downloads().items():
+        path = download(url, cache_dir() / name, check=False)
+        lines.append(f"{sha256(path)}  {name}")
+    checksums_file().write_text("\n".join(lines) + "\n")
+    return list(pinned_downloads())
+
+
+def cached(name):
+    """Cached copy of the pinned download ``name``, verified before use"""
+    path = cache_dir() / name
+    if path.exists():
+        return verify(path)
+    return download(pinned_downloads()[name], path)
+
+
+def tailwind_cli():
+    """Path of the pinned Tailwind CLI, downloaded on first use"""
+    if cli := os.environ.get("TAILWIND_CLI"):
+        return cli
+    target = TAILWIND_TARGETS.get((platform.system(), platform.machine()))
+    if target is None:
+        raise AssetBuildError(
+            f"No Tailwind CLI build for {platform.system()} {platform.machine()}; "
+            "install one and set TAILWIND_CLI"
+        )
+    path = cached(tailwind_name(target))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def build_stylesheet(watch=False):
+    """Compile the stylesheet; with ``watch``, keep recompiling it as the
+    templates change until interrupted"""
+    output = output_dir() / STYLESHEET
+    output.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        tailwind_cli(),
+        "--config",
+        str(settings.BASE_DIR / "tailwind.config.js"),
+        "--input",
+        str(settings.BASE_DIR / "assets" / "tailwind.css"),
+        "--output",
+        str(output),
+        "--minify",
+    ]
+    if watch:
+        command.append("--watch")
+    try:
+        subprocess.run(
+            command,
+            cwd=settings.BASE_DIR,
+            capture_output=not watch,
+            text=True,
+            check=True,
+        )
+    except OSError as e:
+        raise AssetBuildError(f"Could not run the Tailwind CLI: {e}")
+    except subprocess.CalledProcessError as e:
+        raise AssetBuildError(f"Tailwind CLI failed:\n{e.stderr}")
+    return output
+
+
+def vendor_htmx():
+    source = cached(htmx_name())
+    output = output_dir() / HTMX
+    output.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, output)
+    return output
+
+
+def build_assets():
+    """Write every built asset; returns their paths"""
+    return [build_stylesheet(), vendor_htmx()]
@@ -0,0 +1,123 @@
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+CACHE_RESULTS = Counter(
+    "mysite_cache_get_or_compute_total",
+    "get_or_compute lookups by cache name and outcome",
+    ["name", "result"],
+)
+
+# How long past its soft expiry a value may still be served while another
+# worker recomputes it.
+DEFAULT_STALE_TTL = 300
+# Upper bound on how long one recomputation holds the lock.
+DEFAULT_LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _record(name, result):
+    CACHE_RESULTS.labels(name=name, result=result).inc()
+
+
+def _should_refresh(entry, beta):
+    """Probabilistic early expiration (XFetch).
+
+    Each reader refreshes early with a probability that rises as expiry
+    approaches, scaled by how long the value took to compute. One worker
+    then usually refreshes the key before it expires, instead of every
+    worker at the moment it expires.
+    """
+    jitter = entry["delta"] * beta * -math.log(1.0 - random.random())
+    return time.time() + jitter >= entry["expires"]
+
+
+def _store(key, value, delta, ttl, stale_ttl):
+    entry = {"value": value, "delta": delta, "expires": time.time() + ttl}
+    cache.set(key, entry, ttl + stale_ttl)
+
+
+def _compute_and_store(key, compute, ttl, stale_ttl):
+    started = time.monotonic()
+    value = compute()
+    _store(key, value, time.monotonic() - started, ttl, stale_ttl)
+    return value
+
+
+def get_or_compute(
+    key,
+    compute,
+    ttl,
+    *,
+    name=None,
+    stale_ttl=DEFAULT_STALE_TTL,
+    beta=1.0,
+    lock_timeout=DEFAULT_LOCK_TIMEOUT,
+):
+    """Return the cached value for ``key``, calling ``compute()`` to fill it.
+
+    Only one process recomputes a key at a time (a lock taken with
+    ``cache.add``). While it does, other callers get the stale value, or wait
+    for the new one if there is no stale value. Values are refreshed
+    probabilistically before ``ttl`` runs out to spread recomputation.
+    ``name`` labels the hit/miss/recompute counters (defaults to ``key``).
+    Works the same from views, serializers and Celery tasks.
+    """
+    name = name or key
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Cache read for {key} failed, computing directly: {e}")
+        _record(name, "error")
+        return compute()
+
+    if entry is not None and not _should_refresh(entry, beta):
+        _record(name, "hit")
+        return entry["value"]
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    try:
+        acquired = cache.add(lock_key, token, lock_timeout)
+    except Exception as e:
+        logger.warning(f"Cache lock for {key} failed, computing directly: {e}")
+        _record(name, "error")
+        return compute()
+
+    if acquired:
+        _record(name, "recompute" if entry is not None else "miss")
+        try:
+            return _compute_and_store(key, compute, ttl, stale_ttl)
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    if entry is not None:
+        _record(name, "stale")
+        return entry["value"]
+
+    # Cold key with another worker already computing it: wait for its result
+    _record(name, "wait")
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["value"]
+        if cache.get(lock_key) is None:
+            break
+
+    _record(name, "miss")
+    return _compute_and_store(key, compute, ttl, stale_ttl)
+
+
+def invalidate_computed(key):
+    """Drop a value cached by get_or_compute so the next call recomputes it."""
+    cache.delete(key)
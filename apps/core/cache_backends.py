@@ -0,0 +1,40 @@
+"""Cache backends that count hits and misses (see apps.core.instrumentation).
+
+The async methods of these backends fall back to the sync ones, so both are
+counted.
+"""
+
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django.core.cache.backends.redis import RedisCache as BaseRedisCache
+
+from apps.core.instrumentation import record_cache_lookup
+
+_missing = object()
+
+
+class CacheMetricsMixin:
+    """Mix into a cache backend. ``cache_alias`` labels the metrics."""
+
+    cache_alias = "default"
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version=version)
+        if value is _missing:
+            record_cache_lookup(self.cache_alias, 0, 1)
+            return default
+        record_cache_lookup(self.cache_alias, 1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        record_cache_lookup(self.cache_alias, len(found), len(keys) - len(found))
+        return found
+
+
+class RedisCache(CacheMetricsMixin, BaseRedisCache):
+    pass
+
+
+class LocMemCache(CacheMetricsMixin, BaseLocMemCache):
+    pass
@@ -0,0 +1,34 @@
+import pickle
+import zlib
+
+from django.conf import settings
+from django.core.cache.backends.redis import RedisSerializer
+
+# Payloads are tagged with a one-byte marker. Plain pickles always start with
+# the PROTO opcode (0x80), so entries written by the stock serializer still
+# load after switching.
+COMPRESSED = b"z"
+
+
+class CompressedSerializer(RedisSerializer):
+    """Pickle serializer that zlib-compresses payloads above a size threshold.
+
+    Rendered pages and serialized API payloads are repetitive HTML/JSON that
+    typically shrink 4-10x. Integers are still stored raw so ``incr`` works.
+    """
+
+    def __init__(self, protocol=None):
+        super().__init__(protocol)
+        self.min_bytes = settings.CACHE_COMPRESS_MIN_BYTES
+        self.level = settings.CACHE_COMPRESS_LEVEL
+
+    def dumps(self, obj):
+        data = super().dumps(obj)
+        if isinstance(data, int) or len(data) < self.min_bytes:
+            return data
+        return COMPRESSED + zlib.compress(data, self.level)
+
+    def loads(self, data):
+        if data[:1] == COMPRESSED:
+            return pickle.loads(zlib.decompress(data[1:]))
+        return super().loads(data)
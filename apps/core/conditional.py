@@ -0,0 +1,221 @@
+import datetime
+import hashlib
+import weakref
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .page_cache import aget_versions, dependency_names, get_versions
+
+
+def latest_update(queryset):
+    """The newest updated_at of ``queryset`` as a one-row query.
+
+    Written as ORDER BY ... LIMIT 1 on its own so the (published, updated_at)
+    indexes answer it without touching the rows.
+    """
+    return queryset.order_by("-updated_at").values_list("updated_at", flat=True)[:1]
+
+
+def collection_version(queryset):
+    """Cheap version stamp for a collection: its newest updated_at.
+
+    Deletions leave that unchanged; collection ETags also mix in the
+    page-cache version the delete signals bump (see ``collection_etag``).
+    """
+    return _version(latest_update(queryset).first())
+
+
+async def acollection_version(queryset):
+    return _version(await latest_update(queryset).afirst())
+
+
+def _version(latest):
+    return latest.isoformat() if latest else ""
+
+
+def object_last_modified(queryset, **lookup):
+    """updated_at of the single object matching ``lookup``, or None."""
+    return queryset.filter(**lookup).values_list("updated_at", flat=True).first()
+
+
+async def aobject_last_modified(queryset, **lookup):
+    return await queryset.filter(**lookup).values_list("updated_at", flat=True).afirst()
+
+
+def make_etag(request, *parts, user=None):
+    """ETag for a representation of ``parts`` as seen by this request.
+
+    The full path (query string included), the HTMX flag and the viewing user
+    are mixed in because they all change the rendered output. Async callers
+    pass ``user`` (from ``request.auser()``) so the lazy ``request.user`` is
+    not resolved on the event loop.
+    """
+    if user is None:
+        user = getattr(request, "user", None)
+    user_key = user.pk if user is not None and user.is_authenticated else ""
+    key = "|".join(
+        [
+            request.get_full_path(),
+            request.headers.get("HX-Request", ""),
+            str(user_key),
+            *(str(part) for part in parts),
+        ]
+    )
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def collection_etag(*querysets, versions=()):
+    """ETag function for views listing the given querysets.
+
+    ``versions`` are the page-cache dependencies of the view (see
+    ``apps.core.page_cache.cache_page_on``). Their versions are mixed in so
+    deletions and changes to related rows, such as a post's tags, change the
+    ETag too; pass the dependency each queryset's delete signal bumps.
+
+    Like the other validator factories here, the function carries an
+    ``async_version`` using the async ORM, which ``conditional`` uses for
+    async views.
+    """
+
+    def etag_func(request, *args, **kwargs):
+        return make_etag(
+            request,
+            *(collection_version(qs) for qs in querysets),
+            *get_versions(dependency_names(versions, kwargs)),
+        )
+
+    async def aetag_func(request, *args, **kwargs):
+        parts = [await acollection_version(qs) for qs in querysets]
+        parts += await aget_versions(dependency_names(versions, kwargs))
+        return make_etag(request, *parts, user=await request.auser())
+
+    etag_func.async_version = aetag_func
+    return etag_func
+
+
+def object_validators(queryset, lookup_field, versions=()):
+    """(etag_func, last_modified_func) for a view showing the object of
+    ``queryset`` whose ``lookup_field`` matches the URL kwarg of that name.
+
+    Both validators need the object's updated_at; it is looked up once per
+    request and shared. ``versions`` are mixed into the ETag as in
+    ``collection_etag``; the ETag takes precedence over Last-Modified when a
+    client sends both.
+    """
+    seen = weakref.WeakKeyDictionary()
+
+    def last_modified_func(request, *args, **kwargs):
+        if request not in seen:
+            lookup = {lookup_field: kwargs[lookup_field]}
+            seen[request] = object_last_modified(queryset, **lookup)
+        return seen[request]
+
+    def etag_func(request, *args, **kwargs):
+        last_modified = last_modified_func(request, *args, **kwargs)
+        if last_modified is None:
+            return None
+        return make_etag(
+            request,
+            last_modified.isoformat(),
+            *get_versions(dependency_names(versions, kwargs)),
+        )
+
+    async def alast_modified_func(request, *args, **kwargs):
+        if request not in seen:
+            lookup = {lookup_field: kwargs[lookup_field]}
+            seen[request] = await aobject_last_modified(queryset, **lookup)
+        return seen[request]
+
+    async def aetag_func(request, *args, **kwargs):
+        last_modified = await alast_modified_func(request, *args, **kwargs)
+        if last_modified is None:
+            return None
+        dependencies = await aget_versions(dependency_names(versions, kwargs))
+        user = await request.auser()
+        return make_etag(request, last_modified.isoformat(), *dependencies, user=user)
+
+    etag_func.async_version = aetag_func
+    last_modified_func.async_version = alast_modified_func
+    return etag_func, last_modified_func
+
+
+def _async_validator(func):
+    if func is None:
+        return None
+    return getattr(func, "async_version", None) or sync_to_async(func)
+
+
+def async_condition(etag_func=None, last_modified_func=None):
+    """Django's ``condition`` for async views with awaitable validators.
+
+    ``condition`` calls its validators synchronously, which would run ORM
+    queries on the event loop.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def inner(request, *args, **kwargs):
+            res_last_modified = None
+            if last_modified_func:
+                if dt := await last_modified_func(request, *args, **kwargs):
+                    if not timezone.is_aware(dt):
+                        dt = timezone.make_aware(dt, datetime.timezone.utc)
+                    res_last_modified = int(dt.timestamp())
+            res_etag = None
+            if etag_func:
+                res_etag = await etag_func(request, *args, **kwargs)
+                res_etag = quote_etag(res_etag) if res_etag is not None else None
+
+            response = get_conditional_response(
+                request, etag=res_etag, last_modified=res_last_modified
+            )
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if res_last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(res_last_modified)
+                if res_etag:
+                    response.headers.setdefault("ETag", res_etag)
+            return response
+
+        return inner
+
+    return decorator
+
+
+def conditional(etag_func=None, last_modified_func=None):
+    """Answer conditional GETs with 304 before the view does any work.
+
+    Responses are marked ``no-cache`` so clients always revalidate instead of
+    guessing a freshness lifetime from Last-Modified.
+    """
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            view_func = async_condition(
+                etag_func=_async_validator(etag_func),
+                last_modified_func=_async_validator(last_modified_func),
+            )(view_func)
+        else:
+            view_func = condition(
+                etag_func=etag_func, last_modified_func=last_modified_func
+            )(view_func)
+        return cache_control(no_cache=True)(view_func)
+
+    return decorator
+
+
+def conditional_api(etag_func=None, last_modified_func=None):
+    """``conditional`` for the ``get`` handler of class-based API views."""
+    return method_decorator(
+        conditional(etag_func=etag_func, last_modified_func=last_modified_func),
+        name="get",
+    )
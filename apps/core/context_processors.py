@@ -0,0 +1,12 @@
+from django.utils.functional import SimpleLazyObject
+
+from .assets import is_built
+
+
+def front_end_assets(request):
+    """``BUILT_ASSETS``: whether base.html can link the build_assets output.
+
+    Checked only by templates that use it. Until the assets are built, pages
+    fall back to the CDN copies.
+    """
+    return {"BUILT_ASSETS": SimpleLazyObject(is_built)}
@@ -0,0 +1,74 @@
+"""Database backends that report connection metrics.
+
+Django keeps one connection per thread and alias. With ``CONN_MAX_AGE`` and
+``CONN_HEALTH_CHECKS`` the connection is reused across requests and checked
+before reuse. These wrappers export how often connections are opened, how
+long opening takes and how many are open, so reuse can be verified. Every
+query also counts towards the current request's stats
+(apps.core.instrumentation).
+"""
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from apps.core.instrumentation import record_query
+
+CONNECTIONS_OPENED = Counter(
+    "mysite_db_connections_opened_total",
+    "New database connections opened",
+    ["alias"],
+)
+CONNECTION_ERRORS = Counter(
+    "mysite_db_connection_errors_total",
+    "Failed attempts to open a database connection",
+    ["alias"],
+)
+CONNECT_SECONDS = Histogram(
+    "mysite_db_connect_seconds",
+    "Time spent waiting for a new database connection",
+    ["alias"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+CONNECTIONS_ACTIVE = Gauge(
+    "mysite_db_connections_active",
+    "Open database connections held by this process",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+HEALTH_CHECK_FAILURES = Counter(
+    "mysite_db_health_check_failures_total",
+    "Persistent connections found unusable and dropped",
+    ["alias"],
+)
+
+
+class ConnectionMetricsMixin:
+    """Mix into a backend's DatabaseWrapper"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(record_query)
+
+    def get_new_connection(self, conn_params):
+        started = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            CONNECTION_ERRORS.labels(alias=self.alias).inc()
+            raise
+        CONNECT_SECONDS.labels(alias=self.alias).observe(time.perf_counter() - started)
+        CONNECTIONS_OPENED.labels(alias=self.alias).inc()
+        CONNECTIONS_ACTIVE.labels(alias=self.alias).inc()
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            CONNECTIONS_ACTIVE.labels(alias=self.alias).dec()
+        return super()._close()
+
+    def is_usable(self):
+        usable = super().is_usable()
+        if not usable:
+            HEALTH_CHECK_FAILURES.labels(alias=self.alias).inc()
+        return usable
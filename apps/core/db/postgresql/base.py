@@ -0,0 +1,7 @@
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresWrapper
+
+from apps.core.db import ConnectionMetricsMixin
+
+
+class DatabaseWrapper(ConnectionMetricsMixin, PostgresWrapper):
+    pass
@@ -0,0 +1,262 @@
+"""Read-replica routing.
+
+Replicas only serve reads for views marked safe for them: function views
+decorated with ``replica_reads`` and DRF ``ListAPIView``/``RetrieveAPIView``
+classes. Everything else (admin, dashboard, forms, Celery tasks, migrations)
+uses the primary. ``ReplicaRoutingMiddleware`` picks one healthy replica per
+request and pins a client to the primary for a few seconds after it writes
+or its session changes, so it reads its own writes. A replica that is down
+or further behind than ``REPLICA_MAX_LAG`` seconds is skipped until its next
+check, and a view whose replica fails mid-request is retried once on the
+primary.
+
+Reads that rebuild a cached page must not come from a lagging replica: the
+stale result would be stored under the new cache version. So for
+``REPLICA_PIN_SECONDS`` after any cache invalidation (``reads_to_primary``),
+every read goes to the primary.
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, OperationalError, connections
+from prometheus_client import Gauge
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG = Gauge(
+    "mysite_db_replica_lag_seconds",
+    "Replication lag seen by the last health check (-1 when unreachable)",
+    ["alias"],
+    multiprocess_mode="max",
+)
+
+PIN_COOKIE = "primary_pin"
+# Set while replicas may still be serving rows from before the last
+# invalidation
+RECENT_INVALIDATION_KEY = "db-router:recent-invalidation"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+REPLICA_VIEW_CLASSES = (ListAPIView, RetrieveAPIView)
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary is not lag).
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+_read_alias = contextvars.ContextVar("replica_read_alias", default=None)
+
+
+def replica_reads(view_func):
+    """Mark a read-only view as safe to serve from a replica"""
+    view_func.replica_reads = True
+    return view_func
+
+
+def is_replica_safe(view_func):
+    if getattr(view_func, "replica_reads", False):
+        return True
+    view_class = getattr(view_func, "view_class", None)
+    return isinstance(view_class, type) and issubclass(view_class, REPLICA_VIEW_CLASSES)
+
+
+class ReplicaHealth:
+    """Per-process cache of which replicas are reachable and caught up"""
+
+    def __init__(self):
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        checked = self._checked.get(alias)
+        if checked is not None and now - checked[1] < settings.REPLICA_CHECK_INTERVAL:
+            return checked[0]
+        with self._lock:
+            healthy = self.check(alias)
+            self._checked[alias] = (healthy, now)
+        return healthy
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute(POSTGRES_LAG_SQL)
+                    lag = float(cursor.fetchone()[0])
+            else:
+                connection.ensure_connection()
+                lag = 0.0
+        except DatabaseError as e:
+            logger.warning(f"Replica {alias} unavailable, reading from primary: {e}")
+            REPLICA_LAG.labels(alias=alias).set(-1)
+            connection.close()
+            return False
+
+        REPLICA_LAG.labels(alias=alias).set(lag)
+        if lag > settings.REPLICA_MAX_LAG:
+            logger.warning(f"Replica {alias} is {lag:.1f}s behind, skipping it")
+            return False
+        return True
+
+    def mark_unhealthy(self, alias):
+        self._checked[alias] = (False, time.monotonic())
+
+    def reset(self):
+        self._checked.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+def pick_replica():
+    """A random healthy replica alias, or None to use the primary"""
+    healthy = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if replica_health.is_healthy(alias)
+    ]
+    return random.choice(healthy) if healthy else None
+
+
+def reads_to_primary():
+    """Send every read to the primary for ``REPLICA_PIN_SECONDS``. Called when
+    cached content is invalidated, so it is rebuilt from current rows."""
+    if not settings.DATABASE_REPLICAS:
+        return
+    try:
+        cache.set(RECENT_INVALIDATION_KEY, 1, timeout=settings.REPLICA_PIN_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not route reads to the primary: {e}")
+
+
+def _recently_invalidated():
+    try:
+        return cache.get(RECENT_INVALIDATION_KEY) is not None
+    except Exception:
+        # Nothing can be cached either, so stale reads are not kept
+        return False
+
+
+class use_replica:
+    """Context manager routing reads in the block to a healthy replica,
+    e.g. for reports run outside a request."""
+
+    def __enter__(self):
+        self._token = _read_alias.set(pick_replica())
+        return _read_alias.get()
+
+    def __exit__(self, *exc_info):
+        _read_alias.reset(self._token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if settings.DATABASE_REPLICAS and self.wrote(request, response):
+            # Keep this client on the primary until replicas have caught up
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def wrote(self, request, response):
+        """Whether the request may have written: an unsafe method, or a GET
+        that changed the session, such as an OAuth callback logging in"""
+        if request.method not in SAFE_METHODS:
+            return True
+        session = getattr(request, "session", None)
+        return (session is not None and session.modified) or (
+            settings.SESSION_COOKIE_NAME in response.cookies
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+            and is_replica_safe(view_func)
+            and not _recently_invalidated()
+        ):
+            alias = pick_replica()
+            _read_alias.set(alias)
+            if alias is not None:
+                request._replica_view = (view_func, view_args, view_kwargs)
+
+    def process_exception(self, request, exception):
+        """Retry a view once on the primary when its replica failed"""
+        alias = _read_alias.get()
+        replica_view = getattr(request, "_replica_view", None)
+        if (
+            alias is None
+            or replica_view is None
+            or not isinstance(exception, OperationalError)
+        ):
+            return None
+        logger.warning(f"Replica {alias} failed, retrying on primary: {exception}")
+        replica_health.mark_unhealthy(alias)
+        connections[alias].close()
+        del request._replica_view
+        _read_alias.set(None)
+
+        view_func, view_args, view_kwargs = replica_view
+        if iscoroutinefunction(view_func):
+            # Exception middleware runs in a worker thread for async views
+            return async_to_sync(view_func)(request, *view_args, **view_kwargs)
+        return view_func(request, *view_args, **view_kwargs)
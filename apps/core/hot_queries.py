@@ -0,0 +1,26 @@
+"""Registry of the querysets behind the busiest pages.
+
+Apps list theirs in a ``hot_queries`` module, collected with
+``autodiscover()`` the way the admin collects ``admin`` modules. Each entry
+is a callable returning a fresh queryset, so it can pick sample values (a
+slug, a tag) from whatever data is present.
+"""
+
+from django.utils.module_loading import autodiscover_modules
+
+registry = {}
+
+
+def register(name):
+    """Decorator: ``@register("blog.post_list")`` on a queryset factory"""
+
+    def decorator(factory):
+        registry[name] = factory
+        return factory
+
+    return decorator
+
+
+def autodiscover():
+    autodiscover_modules("hot_queries")
+    return registry
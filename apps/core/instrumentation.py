@@ -0,0 +1,190 @@
+"""Per-request performance instrumentation.
+
+``RequestTimingMiddleware`` opens a ``RequestStats`` for each request. The
+database backends (apps.core.db), cache backends (apps.core.cache_backends)
+and template backend (apps.core.template_backends) add to the stats of the
+request they run in, found through a context variable so it also follows
+async views into the threads running their ORM calls. When the response is
+ready the totals are exported as Prometheus histograms labelled by view and
+sent to the client in a ``Server-Timing`` header.
+"""
+
+import contextvars
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.module_loading import import_string
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+VIEW_SECONDS = Histogram(
+    "mysite_view_seconds",
+    "Time to produce a response, by view",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+VIEW_DB_QUERIES = Histogram(
+    "mysite_view_db_queries",
+    "Database queries per request, by view",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+VIEW_DB_SECONDS = Histogram(
+    "mysite_view_db_seconds",
+    "Time spent in database queries per request, by view",
+    ["view"],
+    buckets=LATENCY_BUCKETS,
+)
+VIEW_TEMPLATE_SECONDS = Histogram(
+    "mysite_view_template_seconds",
+    "Time spent rendering templates per request, by view",
+    ["view"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "mysite_cache_lookups_total",
+    "Cache reads by cache alias and result (hit or miss)",
+    ["cache", "result"],
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "mysite_view_query_budget_exceeded_total",
+    "Requests that ran more queries than their view's budget, by view",
+    ["view"],
+)
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.template_seconds = 0.0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Value of the Server-Timing header, durations in milliseconds"""
+        return ", ".join(
+            [
+                f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+                f'cache;desc="{self.cache_hits} hits / {self.cache_misses} misses"',
+                f"tpl;dur={self.template_seconds * 1000:.1f}",
+                f"total;dur={self.elapsed * 1000:.1f}",
+            ]
+        )
+
+
+def current_stats():
+    """Stats of the request being handled, or None outside a request"""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and their time"""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def record_cache_lookup(alias, hits, misses):
+    if hits:
+        CACHE_LOOKUPS.labels(cache=alias, result="hit").inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(cache=alias, result="miss").inc(misses)
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+def record_template(seconds):
+    stats = _current.get()
+    if stats is not None:
+        stats.template_seconds += seconds
+
+
+def query_budget(view):
+    """Most queries ``view`` may run: its entry in the QUERY_BUDGETS
+    registry, else REQUEST_QUERY_BUDGET (None for no limit)"""
+    budgets = getattr(settings, "QUERY_BUDGETS", None)
+    if isinstance(budgets, str):
+        budgets = import_string(budgets)
+    return (budgets or {}).get(view, settings.REQUEST_QUERY_BUDGET)
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "<unresolved>"
+
+
+class RequestTimingMiddleware:
+    """Export per-view timings and add a Server-Timing header.
+
+    Place it right after PrometheusBeforeMiddleware so the total covers the
+    rest of the middleware chain. The header can be turned off with
+    ``SERVER_TIMING = False``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.process_response(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.process_response(request, response, stats)
+
+    def process_response(self, request, response, stats):
+        view = _view_name(request)
+        VIEW_SECONDS.labels(view=view, method=request.method).observe(stats.elapsed)
+        VIEW_DB_QUERIES.labels(view=view).observe(stats.db_queries)
+        VIEW_DB_SECONDS.labels(view=view).observe(stats.db_seconds)
+        VIEW_TEMPLATE_SECONDS.labels(view=view).observe(stats.template_seconds)
+
+        budget = query_budget(view)
+        if budget is not None and stats.db_queries > budget:
+            QUERY_BUDGET_EXCEEDED.labels(view=view).inc()
+            logger.warning(
+                f"{view} ran {stats.db_queries} queries for {request.path} "
+                f"(budget {budget})"
+            )
+
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = stats.server_timing()
+        return response
@@ -0,0 +1,169 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from prometheus_client import Counter, Gauge
+
+from .cache import get_or_compute
+from .db_router import reads_to_primary
+from .redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHE_EVENTS = Counter(
+    "mysite_local_cache_events_total",
+    "In-process cache lookups and evictions",
+    ["event"],
+)
+LOCAL_CACHE_SIZE = Gauge(
+    "mysite_local_cache_entries",
+    "Entries held in this process's local cache",
+    multiprocess_mode="livesum",
+)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Bounded, thread-safe LRU with per-entry TTL for one process."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._entries.get(key, _MISSING)
+            if item is not _MISSING and item[1] < time.monotonic():
+                del self._entries[key]
+                item = _MISSING
+            if item is _MISSING:
+                LOCAL_CACHE_EVENTS.labels(event="miss").inc()
+                return default
+            self._entries.move_to_end(key)
+        LOCAL_CACHE_EVENTS.labels(event="hit").inc()
+        return item[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                LOCAL_CACHE_EVENTS.labels(event="eviction").inc()
+            LOCAL_CACHE_SIZE.set(len(self._entries))
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            LOCAL_CACHE_SIZE.set(len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            LOCAL_CACHE_SIZE.set(0)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_cache = LocalCache(settings.LOCAL_CACHE["MAX_ENTRIES"])
+
+
+class InvalidationListener:
+    """Evicts local entries when any process publishes an invalidation.
+
+    Runs as a daemon thread per process, started on first use so it survives
+    gunicorn's fork. If the subscription drops, messages may have been
+    missed, so the whole local cache is cleared before resubscribing.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_running(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            thread = threading.Thread(
+                target=self._run, name="local-cache-invalidation", daemon=True
+            )
+            thread.start()
+
+    def _run(self):
+        backoff = 1
+        while True:
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = 1
+                for message in pubsub.listen():
+                    local_cache.delete(message["data"].decode())
+            except Exception as e:
+                logger.warning(f"Local cache invalidation listener failed: {e}")
+            local_cache.clear()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+_listener = InvalidationListener(settings.LOCAL_CACHE["CHANNEL"])
+
+
+def _pubsub_enabled():
+    return settings.LOCAL_CACHE["PUBSUB"]
+
+
+def get_tiered(key, compute, ttl, *, local_ttl=None, name=None):
+    """get_or_compute with an in-process tier in front of Redis.
+
+    For tiny, very hot values. Local copies live at most ``local_ttl``
+    seconds (``LOCAL_CACHE["TTL"]`` by default), and ``invalidate_tiered``
+    evicts them from every process immediately.
+    """
+    if _pubsub_enabled():
+        _listener.ensure_running()
+
+    value = local_cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = get_or_compute(key, compute, ttl, name=name)
+    local_cache.set(key, value, local_ttl or settings.LOCAL_CACHE["TTL"])
+    return value
+
+
+def invalidate_tiered_on_commit(*keys):
+    """``invalidate_tiered()`` once the current transaction commits, so the
+    value is not recomputed from rows that are about to change"""
+    transaction.on_commit(lambda: invalidate_tiered(*keys))
+
+
+def invalidate_tiered(*keys):
+    """Drop ``keys`` from Redis and from the local tier of every process."""
+    reads_to_primary()
+    for key in keys:
+        local_cache.delete(key)
+        try:
+            cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Cache delete for {key} failed: {e}")
+
+    if not _pubsub_enabled():
+        return
+    try:
+        client = get_redis_client()
+        for key in keys:
+            client.publish(settings.LOCAL_CACHE["CHANNEL"], key)
+    except Exception as e:
+        logger.warning(f"Local cache invalidation publish failed: {e}")
@@ -0,0 +1,118 @@
+import json
+import time
+from datetime import datetime, timezone
+
+from django.core.cache.backends.redis import RedisSerializer
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+
+from apps.core.cache_serializers import CompressedSerializer
+from apps.core.redis_pool import get_redis_client
+
+
+def sample_payloads():
+    """Representative cache values: a rendered page, an API page, a counter"""
+    now = datetime.now(timezone.utc).isoformat()
+    api_page = [
+        {
+            "id": i,
+            "title": f"Notes from the line, part {i}",
+            "slug": f"notes-from-the-line-part-{i}",
+            "excerpt": "Railway operations, signalling and the odd Django "
+            "experiment from a conductor who codes as a hobby. " * 2,
+            "word_count": 1200 + i,
+            "reading_time": 6,
+            "tags": [{"id": 1, "name": "Django", "slug": "django"}],
+            "author": "admin",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(20)
+    ]
+    return {
+        "page": render_to_string("about.html"),
+        "api_page": api_page,
+        "counter": {"total_posts": 1234, "published_posts": 1200},
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare size and latency of the default and compressed cache serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=1000,
+            help="Serialize/deserialize rounds per payload (default: 1000)",
+        )
+        parser.add_argument(
+            "--live",
+            action="store_true",
+            help="Also measure Redis memory usage and round trips at REDIS_URL",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        serializers = {
+            "pickle": RedisSerializer(),
+            "compressed": CompressedSerializer(),
+        }
+        client = get_redis_client() if options["live"] else None
+        results = []
+
+        for payload_name, payload in sample_payloads().items():
+            for serializer_name, serializer in serializers.items():
+                result = self.measure(serializer, payload, options["iterations"])
+                result.update(payload=payload_name, serializer=serializer_name)
+                if client is not None:
+                    result.update(
+                        self.measure_live(
+                            client, serializer, payload, options["iterations"]
+                        )
+                    )
+                results.append(result)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for result in results:
+            line = (
+                f"{result['payload']:<10} {result['serializer']:<11} "
+                f"{result['bytes']:>8} B  dumps {result['dumps_us']:>8.1f} us  "
+                f"loads {result['loads_us']:>8.1f} us"
+            )
+            if "redis_memory_bytes" in result:
+                line += (
+                    f"  redis {result['redis_memory_bytes']:>8} B  "
+                    f"get {result['redis_get_us']:>8.1f} us"
+                )
+            self.stdout.write(line)
+
+    def measure(self, serializer, payload, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            data = serializer.dumps(payload)
+        dumps_us = (time.perf_counter() - started) / iterations * 1e6
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            serializer.loads(data)
+        loads_us = (time.perf_counter() - started) / iterations * 1e6
+
+        return {"bytes": len(data), "dumps_us": dumps_us, "loads_us": loads_us}
+
+    def measure_live(self, client, serializer, payload, iterations):
+        key = "benchmark_cache:payload"
+        try:
+            client.set(key, serializer.dumps(payload))
+            memory = client.memory_usage(key)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                serializer.loads(client.get(key))
+            get_us = (time.perf_counter() - started) / iterations * 1e6
+            client.delete(key)
+        except Exception as e:
+            raise CommandError(f"Redis benchmark failed: {str(e)}")
+        return {"redis_memory_bytes": memory, "redis_get_us": get_us}
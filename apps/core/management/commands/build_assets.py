@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.assets import (
+    AssetBuildError,
+    build_assets,
+    build_stylesheet,
+    is_pinned,
+    pin,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the Tailwind stylesheet from the templates and vendor htmx "
+        "into static/dist/; run collectstatic afterwards to fingerprint them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep rebuilding the stylesheet as templates change",
+        )
+
+        parser.add_argument(
+            "--pin",
+            action="store_true",
+            help="Download the pinned versions and record their SHA-256 "
+            "digests in assets/SHA256SUMS instead of building",
+        )
+
+        parser.add_argument(
+            "--if-pinned",
+            action="store_true",
+            help="Skip the build, without failing, until assets/SHA256SUMS "
+            "has every digest",
+        )
+
+    def handle(self, *args, **options):
+        if options["if_pinned"] and not is_pinned():
+            self.stdout.write(
+                self.style.WARNING(
+                    "No digests pinned in assets/SHA256SUMS yet, skipping the "
+                    "build; pages load the CDN copies until it runs"
+                )
+            )
+            return
+        try:
+            if options["pin"]:
+                for name in pin():
+                    self.stdout.write(f"Pinned {name}")
+                return
+            paths = build_assets()
+            self.report(paths)
+            if options["watch"]:
+                self.stdout.write("Watching templates, Ctrl-C to stop")
+                build_stylesheet(watch=True)
+        except AssetBuildError as e:
+            raise CommandError(str(e))
+        except KeyboardInterrupt:
+            pass
+
+    def report(self, paths):
+        for path in paths:
+            size = path.stat().st_size / 1024
+            name = path.relative_to(settings.BASE_DIR)
+            self.stdout.write(f"Wrote {name} ({size:.1f} KiB)")
@@ -0,0 +1,116 @@
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.hot_queries import autodiscover
+
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    # "SCAN t" is a full scan; "SCAN t USING [COVERING] INDEX i" is not.
+    # SQLite also prints a bare "SCAN t" for walking the primary key in
+    # order, so ORDER BY id ... LIMIT n is a false positive there.
+    "sqlite": re.compile(r"\bSCAN (\w+)(?!\w| USING)"),
+}
+
+
+def seed_records(count):
+    """Posts spread over several years with a few tags each, plus projects"""
+    now = timezone.now()
+    for i in range(count):
+        created_at = now - timedelta(hours=i * 7)
+        yield {
+            "title": f"Seeded post {i}",
+            "body": f"Seeded body {i} " * 50,
+            "tags": [f"seed-tag-{i % 25}", f"seed-tag-{i % 7}"],
+            "published": i % 10 != 0,
+            "created_at": created_at.isoformat(),
+        }
+    for i in range(max(count // 20, 1)):
+        yield {
+            "type": "project",
+            "title": f"Seeded project {i}",
+            "description": "Seeded",
+            "featured": i % 5 == 0,
+            "created_at": (now - timedelta(days=i)).isoformat(),
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on every registered hot query (hot_queries modules) "
+        "and flag sequential scans"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many sample posts first, rolled back afterwards",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error if any query scans a whole table",
+        )
+        parser.add_argument(
+            "--only", help="Only explain queries whose name starts with this"
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            self.stderr.write(
+                f"Sequential scan detection is not supported on {connection.vendor}"
+            )
+
+        with transaction.atomic():
+            if options["seed"]:
+                self.seed(options["seed"])
+            flagged = self.explain_all(pattern, options["only"])
+            transaction.set_rollback(True)
+
+        if flagged:
+            message = f"Sequential scans in: {', '.join(flagged)}"
+            if options["fail_on_seq_scan"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No sequential scans"))
+
+    def seed(self, count):
+        from blog.importer import ContentImporter
+
+        author = User.objects.create(username="explain-hot-queries-seed")
+        ContentImporter(default_author=author.username).run(seed_records(count))
+        if connection.vendor == "postgresql":
+            # Fresh statistics, or the planner assumes the tables are tiny
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        self.stdout.write(f"Seeded {count} posts (rolled back when done)\n")
+
+    def explain_all(self, pattern, only=None):
+        flagged = []
+        for name, factory in sorted(autodiscover().items()):
+            if only and not name.startswith(only):
+                continue
+            queryset = factory()
+            if connection.vendor == "postgresql":
+                plan = queryset.explain(analyze=True, buffers=True)
+            else:
+                plan = queryset.explain()
+
+            scans = sorted(set(pattern.findall(plan))) if pattern else []
+            if scans:
+                flagged.append(name)
+                status = self.style.ERROR(f"SEQ SCAN {', '.join(scans)}")
+            else:
+                status = self.style.SUCCESS("ok")
+            self.stdout.write(f"{name}: {status}")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+        return flagged
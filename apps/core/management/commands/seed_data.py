@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.seeding import DEFAULT_BATCH_SIZE, DataSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, tags, posts and projects for load and "
+        "capacity testing, written with COPY on PostgreSQL"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--projects", type=int, default=0)
+        parser.add_argument("--users", type=int, default=10, help="Post authors")
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed; the same seed generates the same content",
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            default=5,
+            help="Spread post dates over this many years (default: 5)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                "Rows generated and written at a time "
+                f"(default: {DEFAULT_BATCH_SIZE})"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        for name in ("posts", "tags", "projects", "users"):
+            if options[name] < 0:
+                raise CommandError(f"--{name} cannot be negative")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        seeder = DataSeeder(
+            posts=options["posts"],
+            tags=options["tags"],
+            projects=options["projects"],
+            users=options["users"],
+            seed=options["seed"],
+            years=options["years"],
+            batch_size=options["batch_size"],
+            progress=self.report_progress,
+        )
+        self.started = time.perf_counter()
+        try:
+            counts = seeder.run()
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - self.started
+
+        rows = counts["posts"] + counts["projects"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {counts['posts']} posts, {counts['tags']} tags, "
+                f"{counts['projects']} projects and {options['users']} users in "
+                f"{elapsed:.1f}s ({rows / elapsed if elapsed else rows:.0f} rows/s). "
+                "Run the rebuild_related_posts task to fill in related posts."
+            )
+        )
+
+    def report_progress(self, name, done, total):
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f"  {name}: {done}/{total} ({elapsed:.1f}s)")
@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .db_router import reads_to_primary
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "page-cache:version:"
+
+
+def _version_key(dependency):
+    return f"{VERSION_KEY_PREFIX}{dependency}"
+
+
+def _fresh_version():
+    # Seeded from the clock so a version key lost to eviction never comes back
+    # with a value that old cache entries were stored under.
+    return int(time.time() * 1000)
+
+
+def get_versions(dependencies):
+    keys = [_version_key(dependency) for dependency in dependencies]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _fresh_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(dependencies):
+    keys = [_version_key(dependency) for dependency in dependencies]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, _fresh_version(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*dependencies):
+    """Bump the version of each dependency so pages built on it are rebuilt."""
+    # From the primary: a lagging replica would rebuild them from old rows
+    reads_to_primary()
+    for dependency in dependencies:
+        key = _version_key(dependency)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _fresh_version(), timeout=None)
+        except Exception as e:
+            logger.warning(f"Page cache invalidation of {dependency} failed: {e}")
+
+
+def invalidate_on_commit(*dependencies):
+    """``invalidate()`` once the current transaction commits (at once outside
+    one). Bumping earlier lets a concurrent request rebuild the page from the
+    uncommitted, old rows and cache it under the new version."""
+    transaction.on_commit(lambda: invalidate(*dependencies))
+
+
+def dependency_names(dependencies, kwargs):
+    """Resolve ``dependencies`` (names, or callables taking the view kwargs)
+    for one request"""
+    return [
+        dependency(**kwargs) if callable(dependency) else dependency
+        for dependency in dependencies
+    ]
+
+
+def _is_cacheable_request(request):
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if "messages" in request.COOKIES:
+        return False
+    return not request.user.is_authenticated
+
+
+async def _ais_cacheable_request(request):
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if "messages" in request.COOKIES:
+        return False
+    user = await request.auser()
+    return not user.is_authenticated
+
+
+def _cache_key(request, view_name, versions):
+    variant = "|".join(
+        [
+            request.get_full_path(),
+            request.headers.get("HX-Request", ""),
+            *(str(version) for version in versions),
+        ]
+    )
+    digest = hashlib.md5(variant.encode()).hexdigest()
+    return f"page-cache:{view_name}:{digest}"
+
+
+def _not_modified(request, response):
+    last_modified = response.get("Last-Modified")
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+    )
+
+
+def cache_page_on(*dependencies):
+    """Cache whole anonymous responses until one of ``dependencies`` changes.
+
+    Each dependency is a string, or a callable taking the view kwargs and
+    returning one (e.g. ``lambda slug: f"post:{slug}"``). Signal handlers call
+    ``invalidate()`` with the same names when the underlying rows change.
+    Async views get an async wrapper using the async cache API.
+    """
+
+    def names(kwargs):
+        return dependency_names(dependencies, kwargs)
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            return _async_cache_page(view_func, names)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not (
+                getattr(settings, "PAGE_CACHE_ENABLED", True)
+                and _is_cacheable_request(request)
+            ):
+                return view_func(request, *args, **kwargs)
+
+            try:
+                versions = get_versions(names(kwargs))
+                key = _cache_key(request, view_func.__name__, versions)
+                response = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Page cache unavailable: {e}")
+                return view_func(request, *args, **kwargs)
+
+            if response is not None:
+                response["X-Page-Cache"] = "hit"
+                return _not_modified(request, response) or response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                try:
+                    cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Page cache store failed: {e}")
+            response["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _async_cache_page(view_func, names):
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not (
+            getattr(settings, "PAGE_CACHE_ENABLED", True)
+            and await _ais_cacheable_request(request)
+        ):
+            return await view_func(request, *args, **kwargs)
+
+        try:
+            versions = await aget_versions(names(kwargs))
+            key = _cache_key(request, view_func.__name__, versions)
+            response = await cache.aget(key)
+        except Exception as e:
+            logger.warning(f"Page cache unavailable: {e}")
+            return await view_func(request, *args, **kwargs)
+
+        if response is not None:
+            response["X-Page-Cache"] = "hit"
+            return _not_modified(request, response) or response
+
+        response = await view_func(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            try:
+                await cache.aset(key, response, settings.PAGE_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Page cache store failed: {e}")
+        response["X-Page-Cache"] = "miss"
+        return response
+
+    return wrapper
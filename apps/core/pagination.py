@@ -0,0 +1,82 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Cursor pagination over (created_at, id): no COUNT and no OFFSET scans."""
+
+    page_size = 20
+    ordering = ["-created_at", "-id"]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+class KeysetPage:
+    """A page of newest-first results plus the cursor for the next page."""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _keyset_queryset(queryset, cursor, per_page):
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+    return queryset[: per_page + 1]
+
+
+def _keyset_page(items, per_page):
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1])
+    return KeysetPage(items, next_cursor)
+
+
+def paginate_keyset(queryset, cursor=None, per_page=10):
+    """Return the page of ``queryset`` (newest first) following ``cursor``.
+
+    Each page is a single indexed range query on (created_at, id), so its cost
+    does not grow with how deep into the archive the reader has scrolled.
+    """
+    items = list(_keyset_queryset(queryset, cursor, per_page))
+    return _keyset_page(items, per_page)
+
+
+async def apaginate_keyset(queryset, cursor=None, per_page=10):
+    """Async version of ``paginate_keyset``."""
+    items = [obj async for obj in _keyset_queryset(queryset, cursor, per_page)]
+    return _keyset_page(items, per_page)
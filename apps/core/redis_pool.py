@@ -0,0 +1,33 @@
+import threading
+
+import redis
+from django.conf import settings
+
+
+class SharedConnectionPool(redis.ConnectionPool):
+    """ConnectionPool that hands out one pool per URL for the whole process.
+
+    Used as the cache backend's ``pool_class`` so the Django cache, the
+    health check and the local-cache pub/sub all share the same sockets
+    instead of each opening their own. The options of the first caller for a
+    URL win. redis-py resets the pool's connections after a fork.
+    """
+
+    _pools = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        with cls._lock:
+            if url not in cls._pools:
+                cls._pools[url] = super().from_url(url, **kwargs)
+            return cls._pools[url]
+
+
+def get_redis_client(url=None):
+    """redis.Redis client on the shared pool for ``url`` (REDIS_URL by default)"""
+    pool = SharedConnectionPool.from_url(
+        url or settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+    )
+    return redis.Redis(connection_pool=pool)
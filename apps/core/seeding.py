@@ -0,0 +1,330 @@
+"""Synthetic content for load and capacity testing (see the seed_data command).
+
+Rows are generated in memory and written set-based: COPY on PostgreSQL,
+bulk INSERTs elsewhere. Primary keys are assigned here, continuing from the
+largest existing id, so posts and their tag links can be written without
+reading anything back; sequences are reset afterwards. The same seed gives
+the same content.
+
+Bodies are assembled from a pool of generated paragraphs, with a log-normal
+paragraph count, so generating text does not dominate the run and each
+post's excerpt and word count are computed once per paragraph rather than
+once per post.
+"""
+
+import csv
+import io
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models, transaction
+from django.utils.text import Truncator, slugify
+
+from apps.core.local_cache import invalidate_tiered_on_commit
+from apps.core.page_cache import invalidate_on_commit
+from blog.cache_keys import TAG_LIST_CACHE_KEY
+from blog.models import EXCERPT_WORDS, WORDS_PER_MINUTE, Post, Tag
+from portfolio.models import Project
+
+PostTag = Post.tags.through
+
+DEFAULT_BATCH_SIZE = 10_000
+PARAGRAPH_POOL = 2_000
+# Content is dated back from here, not from now, so it is reproducible
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+VOCABULARY = (
+    "the of and to in is that for it as with was on be by this are or from at "
+    "an but not have which one all were can more when there their so been has "
+    "would each about how into than them some time these only other could also "
+    "after first well new way use work used because over any most data query "
+    "index cache server request response python django postgres redis worker "
+    "latency throughput template view model migration deploy container metric "
+    "search feed page async stream connection replica budget profile benchmark "
+    "memory disk network thread process queue task schedule release build test"
+).split()
+TOPICS = (
+    "python django postgres redis docker kubernetes celery htmx tailwind api "
+    "performance caching search testing security deployment observability "
+    "databases frontend backend devops architecture career tooling linux"
+).split()
+
+
+def _weights(n, exponent=1.1):
+    """Cumulative Zipf weights: a few tags are on many posts, most on few"""
+    return list(accumulate(1 / (rank**exponent) for rank in range(1, n + 1)))
+
+
+class Writer:
+    """Appends rows with explicit column values to a model's table.
+
+    Rows bypass the model entirely, so auto_now fields keep the generated
+    dates (bulk_create would overwrite them).
+    """
+
+    def __init__(self, model, fields):
+        self.db = connections[DEFAULT_DB_ALIAS]
+        self.fields = [model._meta.get_field(name) for name in fields]
+        qn = self.db.ops.quote_name
+        self.table = qn(model._meta.db_table)
+        self.columns = ", ".join(qn(field.column) for field in self.fields)
+        # Only dates need converting for the driver; skipping the rest keeps
+        # the INSERT path fast
+        self.datetime_columns = [
+            index
+            for index, field in enumerate(self.fields)
+            if isinstance(field, models.DateTimeField)
+        ]
+
+    def write(self, rows):
+        if not rows:
+            return
+        with self.db.cursor() as cursor:
+            if self.db.vendor == "postgresql":
+                self._copy(cursor, rows)
+            else:
+                placeholders = ", ".join(["%s"] * len(self.fields))
+                cursor.executemany(
+                    f"INSERT INTO {self.table} ({self.columns}) "
+                    f"VALUES ({placeholders})",
+                    [self._adapt(row) for row in rows],
+                )
+
+    def _adapt(self, row):
+        row = list(row)
+        for index in self.datetime_columns:
+            row[index] = self.db.ops.adapt_datetimefield_value(row[index])
+        return row
+
+    def _copy(self, cursor, rows):
+        # QUOTE_NONNUMERIC quotes every string (so "" stays an empty string)
+        # and leaves None as the empty unquoted field COPY reads as NULL
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {self.table} ({self.columns}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def _next_id(model):
+    last = model.objects.order_by("-pk").values_list("pk", flat=True).first()
+    return (last or 0) + 1
+
+
+class DataSeeder:
+    """Generate ``posts`` posts over ``tags`` tags, ``projects`` projects and
+    ``users`` authors. Call ``run()``; ``progress(model_name, done, total)``
+    is called after each batch."""
+
+    def __init__(
+        self,
+        posts=0,
+        tags=50,
+        projects=0,
+        users=10,
+        seed=0,
+        years=5,
+        published_ratio=0.95,
+        batch_size=DEFAULT_BATCH_SIZE,
+        progress=None,
+    ):
+        self.counts = {"posts": posts, "tags": tags, "projects": projects}
+        self.users = users
+        self.years = years
+        self.published_ratio = published_ratio
+        self.batch_size = batch_size
+        self.progress = progress or (lambda name, done, total: None)
+        self.rng = random.Random(seed)
+        self.paragraphs = [self._paragraph() for _ in range(PARAGRAPH_POOL)]
+
+    def run(self):
+        with transaction.atomic():
+            author_ids = self.create_users()
+            tag_ids = self.create_tags()
+            if self.counts["posts"]:
+                self.create_posts(author_ids, tag_ids)
+            if self.counts["projects"]:
+                self.create_projects()
+            self.reset_sequences()
+            self.finish()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for model in (Post, PostTag, Tag, Project):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+        return self.counts
+
+    def _paragraph(self):
+        words = self.rng.choices(VOCABULARY, k=self.rng.randint(40, 140))
+        text = " ".join(words)
+        # Excerpt and word count of a body starting with this paragraph
+        return (f"{text[0].upper()}{text[1:]}.", len(words))
+
+    def _title(self):
+        words = self.rng.choices(VOCABULARY, k=self.rng.randint(3, 8))
+        topic = self.rng.choice(TOPICS)
+        return f"{topic.title()}: {' '.join(words)}"[:180]
+
+    def _created_at(self):
+        seconds = self.rng.random() * self.years * 365 * 86_400
+        return EPOCH - timedelta(seconds=seconds)
+
+    def create_users(self):
+        if self.counts["posts"] and not self.users:
+            raise ValueError("At least one user is needed to author posts")
+        start = _next_id(User)
+        password = make_password(None)
+        users = [
+            User(
+                id=start + i,
+                username=f"seed-author-{start + i}",
+                email=f"seed-author-{start + i}@example.com",
+                password=password,
+            )
+            for i in range(self.users)
+        ]
+        User.objects.bulk_create(users)
+        return [user.id for user in users]
+
+    def create_tags(self):
+        start = _next_id(Tag)
+        # Both columns are unique, and "Python" and "python" share a slug
+        existing = list(Tag.objects.values_list("name", "slug"))
+        names = {name for name, _ in existing}
+        slugs = {slug for _, slug in existing}
+        tags = []
+        for i in range(self.counts["tags"]):
+            topic = TOPICS[i % len(TOPICS)]
+            base = topic if i < len(TOPICS) else f"{topic}-{i // len(TOPICS)}"
+            name, suffix = base, start + i
+            while name in names or slugify(name) in slugs:
+                name = f"{base}-{suffix}"
+                suffix += self.counts["tags"]
+            names.add(name)
+            slugs.add(slugify(name))
+            tags.append(Tag(id=start + i, name=name, slug=slugify(name)))
+        Tag.objects.bulk_create(tags)
+        return [tag.id for tag in tags]
+
+    def create_posts(self, author_ids, tag_ids):
+        total = self.counts["posts"]
+        start = _next_id(Post)
+        excerpts = [Truncator(text).words(EXCERPT_WORDS) for text, _ in self.paragraphs]
+        tag_weights = _weights(len(tag_ids)) if tag_ids else None
+        posts = Writer(
+            Post,
+            [
+                "id",
+                "title",
+                "slug",
+                "body",
+                "author_id",
+                "created_at",
+                "updated_at",
+                "published",
+                "excerpt",
+                "word_count",
+                "reading_time",
+            ],
+        )
+        links = Writer(PostTag, ["post_id", "tag_id"])
+
+        for batch_start in range(0, total, self.batch_size):
+            post_rows, link_rows = [], []
+            for pk in range(
+                start + batch_start, start + min(batch_start + self.batch_size, total)
+            ):
+                title = self._title()
+                # Median ~5 paragraphs (~450 words), with a long tail
+                count = min(60, max(1, round(self.rng.lognormvariate(1.6, 0.6))))
+                picks = [self.rng.randrange(PARAGRAPH_POOL) for _ in range(count)]
+                body = "\n\n".join(self.paragraphs[p][0] for p in picks)
+                word_count = sum(self.paragraphs[p][1] for p in picks)
+                created_at = self._created_at()
+                updated_at = min(
+                    EPOCH, created_at + timedelta(days=self.rng.expovariate(1 / 30))
+                )
+                post_rows.append(
+                    (
+                        pk,
+                        title,
+                        f"seed-{pk}-{slugify(title)[:150]}",
+                        body,
+                        self.rng.choice(author_ids),
+                        created_at,
+                        updated_at,
+                        self.rng.random() < self.published_ratio,
+                        excerpts[picks[0]],
+                        word_count,
+                        max(1, -(-word_count // WORDS_PER_MINUTE)),
+                    )
+                )
+                if tag_ids:
+                    chosen = self.rng.choices(
+                        tag_ids, cum_weights=tag_weights, k=self.rng.randint(1, 5)
+                    )
+                    link_rows.extend((pk, tag_id) for tag_id in set(chosen))
+            posts.write(post_rows)
+            links.write(link_rows)
+            self.progress("posts", batch_start + len(post_rows), total)
+
+    def create_projects(self):
+        total = self.counts["projects"]
+        start = _next_id(Project)
+        projects = Writer(
+            Project,
+            [
+                "id",
+                "title",
+                "slug",
+                "description",
+                "link",
+                "github_link",
+                "created_at",
+                "updated_at",
+                "featured",
+            ],
+        )
+        for batch_start in range(0, total, self.batch_size):
+            rows = []
+            for pk in range(
+                start + batch_start, start + min(batch_start + self.batch_size, total)
+            ):
+                title = self._title()
+                slug = f"seed-{pk}-{slugify(title)[:150]}"
+                created_at = self._created_at()
+                rows.append(
+                    (
+                        pk,
+                        title,
+                        slug,
+                        self.paragraphs[self.rng.randrange(PARAGRAPH_POOL)][0],
+                        f"https://example.com/{slug}",
+                        f"https://github.com/example/{slug}",
+                        created_at,
+                        created_at,
+                        self.rng.random() < 0.1,
+                    )
+                )
+            projects.write(rows)
+            self.progress("projects", batch_start + len(rows), total)
+
+    def reset_sequences(self):
+        sql = connection.ops.sequence_reset_sql(
+            no_style(), [User, Tag, Post, PostTag, Project]
+        )
+        if sql:
+            with connection.cursor() as cursor:
+                for statement in sql:
+                    cursor.execute(statement)
+
+    def finish(self):
+        """What the blog and portfolio signals would have done"""
+        Tag.objects.all().refresh_post_counts()
+        invalidate_tiered_on_commit(TAG_LIST_CACHE_KEY)
+        invalidate_on_commit("posts", "tags", "projects")
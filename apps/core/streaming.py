@@ -0,0 +1,53 @@
+"""Streaming responses that stay streamed under ASGI.
+
+Under ASGI, Django consumes a ``StreamingHttpResponse`` over a sync iterator
+with ``sync_to_async(list)``, so the whole body is built in memory before the
+first byte is sent. ``streaming_response`` gives ASGI requests an async
+iterator instead, advancing the sync one in the sync thread (where its
+database connection lives) a batch of chunks at a time. WSGI requests keep
+the sync iterator.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Bytes gathered per trip to the sync thread, so producers yielding many
+# small chunks (a line per record) don't pay a thread hop per chunk
+MIN_CHUNK_SIZE = 64 * 1024
+
+
+def _next_batch(iterator, min_size):
+    """Join chunks from ``iterator`` until ``min_size`` bytes; None at the end"""
+    batch, size = [], 0
+    for chunk in iterator:
+        batch.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            break
+    return b"".join(batch) if batch else None
+
+
+async def aiter_chunks(chunks, min_size=MIN_CHUNK_SIZE):
+    iterator = iter(chunks)
+    try:
+        while (
+            batch := await sync_to_async(_next_batch)(iterator, min_size)
+        ) is not None:
+            yield batch
+    finally:
+        # Runs the generator's cleanup (closing its cursor) if the client
+        # went away mid-stream
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close)()
+
+
+def streaming_response(request, chunks, min_chunk_size=MIN_CHUNK_SIZE, **kwargs):
+    """``StreamingHttpResponse`` over the byte iterator ``chunks``.
+
+    ``min_chunk_size`` applies under ASGI; pass 0 to send every chunk as soon
+    as it is produced.
+    """
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_chunks(chunks, min_chunk_size)
+    return StreamingHttpResponse(chunks, **kwargs)
@@ -0,0 +1,568 @@
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import time
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisSerializer
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from prometheus_client import REGISTRY
+
+from .assets import HTMX_URL, HTMX_VERSION, htmx_name, pinned_downloads
+from .cache import get_or_compute, invalidate_computed
+from .cache_serializers import COMPRESSED, CompressedSerializer
+from .conditional import collection_version
+from .db_router import (
+    PIN_COOKIE,
+    RECENT_INVALIDATION_KEY,
+    ReplicaRoutingMiddleware,
+    is_replica_safe,
+    replica_health,
+)
+from .hot_queries import autodiscover
+from .instrumentation import RequestStats, _current
+from .local_cache import LocalCache, get_tiered, invalidate_tiered, local_cache
+from .page_cache import invalidate
+from .streaming import aiter_chunks, streaming_response
+
+
+class GetOrComputeTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return f"value-{self.calls}"
+
+    def test_miss_then_hit(self):
+        self.assertEqual(get_or_compute("key", self.compute, ttl=60), "value-1")
+        self.assertEqual(get_or_compute("key", self.compute, ttl=60), "value-1")
+        self.assertEqual(self.calls, 1)
+
+    def test_invalidate_forces_recompute(self):
+        get_or_compute("key", self.compute, ttl=60)
+        invalidate_computed("key")
+        self.assertEqual(get_or_compute("key", self.compute, ttl=60), "value-2")
+
+    def test_stale_value_served_while_locked(self):
+        cache.set("key", {"value": "old", "delta": 0, "expires": time.time() - 1})
+        cache.add("key:lock", "other-worker", 30)
+
+        self.assertEqual(get_or_compute("key", self.compute, ttl=60), "old")
+        self.assertEqual(self.calls, 0)
+
+    def test_expired_value_recomputed_by_lock_holder(self):
+        cache.set("key", {"value": "old", "delta": 0, "expires": time.time() - 1})
+
+        self.assertEqual(get_or_compute("key", self.compute, ttl=60), "value-1")
+        self.assertIsNone(cache.get("key:lock"))
+
+    def test_early_refresh_for_slow_values_near_expiry(self):
+        # A value that took 10s to compute and expires in 1s is refreshed early
+        cache.set("key", {"value": "old", "delta": 10, "expires": time.time() + 1})
+
+        with patch("apps.core.cache.random.random", return_value=0.9):
+            self.assertEqual(get_or_compute("key", self.compute, ttl=60), "value-1")
+
+    def test_cache_errors_fall_back_to_compute(self):
+        with patch("apps.core.cache.cache.get", side_effect=ConnectionError):
+            self.assertEqual(get_or_compute("key", self.compute, ttl=60), "value-1")
+
+
+class LocalCacheTest(SimpleTestCase):
+    def test_lru_eviction(self):
+        local = LocalCache(max_entries=2)
+        local.set("a", 1, ttl=60)
+        local.set("b", 2, ttl=60)
+        local.get("a")
+        local.set("c", 3, ttl=60)
+
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(len(local), 2)
+
+    def test_entries_expire(self):
+        local = LocalCache()
+        local.set("a", 1, ttl=-1)
+        self.assertIsNone(local.get("a"))
+
+
+class TieredCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_local_tier_skips_redis(self):
+        get_tiered("key", self.compute, ttl=60)
+        with patch("apps.core.cache.cache.get") as redis_get:
+            self.assertEqual(get_tiered("key", self.compute, ttl=60), 1)
+        redis_get.assert_not_called()
+
+    def test_invalidate_clears_both_tiers(self):
+        get_tiered("key", self.compute, ttl=60)
+        invalidate_tiered("key")
+        self.assertEqual(get_tiered("key", self.compute, ttl=60), 2)
+
+
+class CompressedSerializerTest(SimpleTestCase):
+    def setUp(self):
+        self.serializer = CompressedSerializer()
+
+    def test_large_values_compressed_and_round_trip(self):
+        value = {"html": "<article>post</article>" * 500}
+        data = self.serializer.dumps(value)
+        self.assertTrue(data.startswith(COMPRESSED))
+        self.assertLess(len(data), len(RedisSerializer().dumps(value)))
+        self.assertEqual(self.serializer.loads(data), value)
+
+    def test_small_values_and_ints_unchanged(self):
+        self.assertEqual(self.serializer.dumps(42), 42)
+        self.assertEqual(self.serializer.loads(b"42"), 42)
+        data = self.serializer.dumps("short")
+        self.assertEqual(data, RedisSerializer().dumps("short"))
+        self.assertEqual(self.serializer.loads(data), "short")
+
+
+class ExplainHotQueriesTest(TestCase):
+    def test_registry_collects_app_modules(self):
+        names = autodiscover()
+        self.assertIn("blog.published_listing", names)
+        self.assertIn("portfolio.featured_listing", names)
+
+    def test_hot_queries_use_indexes_on_seeded_data(self):
+        from blog.models import Post
+
+        out = StringIO()
+        call_command("explain_hot_queries", "--seed=200", stdout=out)
+        for name in [
+            "blog.published_listing",
+            "blog.published_last_modified",
+            "blog.published_detail",
+            "blog.tag_listing",
+            "portfolio.api_listing",
+            "portfolio.featured_listing",
+        ]:
+            self.assertIn(f"{name}: ok", out.getvalue())
+        # The seed data is rolled back
+        self.assertFalse(Post.objects.exists())
+
+    def test_last_modified_is_the_query_collection_etags_run(self):
+        from blog.hot_queries import published_last_modified
+        from blog.models import Post
+
+        with CaptureQueriesContext(connections["default"]) as queries:
+            collection_version(Post.objects.published())
+        self.assertEqual(
+            [query["sql"] for query in queries],
+            [str(published_last_modified().query)],
+        )
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTest(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        replica_health.reset()
+        self.addCleanup(replica_health.reset)
+
+    def replica_queries(self, url, **kwargs):
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            with CaptureQueriesContext(connections["default"]) as primary:
+                self.client.get(url, **kwargs)
+        return len(replica), len(primary)
+
+    def test_public_pages_and_api_read_from_replica(self):
+        for url in ["/blog/", "/api/blog/posts/", "/api/portfolio/projects/"]:
+            with self.subTest(url=url):
+                replica, primary = self.replica_queries(url)
+                self.assertGreater(replica, 0)
+                self.assertEqual(primary, 0)
+
+    def test_only_read_views_marked_replica_safe(self):
+        for url, safe in [
+            ("/blog/", True),
+            ("/api/blog/posts/", True),
+            ("/api/blog/tags/", True),
+            ("/dashboard/", False),
+            ("/contact/", False),
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(is_replica_safe(resolve(url).func), safe)
+
+    def test_writes_pin_client_to_primary(self):
+        response = self.client.post("/contact/", {"website": "spam"})
+        self.assertIn(PIN_COOKIE, response.cookies)
+        replica, primary = self.replica_queries("/blog/")
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    def test_lagging_replica_skipped(self):
+        with patch.object(replica_health, "check", return_value=False):
+            replica, primary = self.replica_queries("/blog/")
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    def test_reads_go_to_primary_after_invalidation(self):
+        invalidate("posts")
+        replica, primary = self.replica_queries("/blog/")
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+        cache.delete(RECENT_INVALIDATION_KEY)
+        replica, primary = self.replica_queries("/blog/")
+        self.assertGreater(replica, 0)
+
+    def test_session_change_on_get_pins_client(self):
+        def log_in(request):
+            request.session["_auth_user_id"] = "1"
+            return HttpResponse()
+
+        request = RequestFactory().get("/accounts/google/login/callback/")
+        request.session = SessionStore()
+        response = ReplicaRoutingMiddleware(log_in)(request)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = RequestFactory().get("/blog/")
+        request.session = SessionStore()
+        response = ReplicaRoutingMiddleware(lambda request: HttpResponse())(request)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_failed_replica_retried_on_primary(self):
+        def fail(execute, sql, params, many, context):
+            raise OperationalError("replica went away")
+
+        for url in ["/blog/", "/api/blog/posts/"]:
+            with self.subTest(url=url):
+                replica_health.reset()
+                with connections["replica"].execute_wrapper(fail):
+                    with CaptureQueriesContext(connections["default"]) as primary:
+                        response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(len(primary), 0)
+                self.assertFalse(replica_health.is_healthy("replica"))
+
+
+class ConnectionMetricsTest(TestCase):
+    def sample(self, name):
+        return REGISTRY.get_sample_value(name, {"alias": "default"}) or 0
+
+    def test_new_connections_counted(self):
+        opened = self.sample("mysite_db_connections_opened_total")
+        active = self.sample("mysite_db_connections_active")
+        timed = self.sample("mysite_db_connect_seconds_count")
+
+        wrapper = connections.create_connection("default")
+        wrapper.ensure_connection()
+        self.assertEqual(self.sample("mysite_db_connections_opened_total"), opened + 1)
+        self.assertEqual(self.sample("mysite_db_connections_active"), active + 1)
+        self.assertEqual(self.sample("mysite_db_connect_seconds_count"), timed + 1)
+
+        # SQLite ignores close() for in-memory databases
+        wrapper._close()
+        self.assertEqual(self.sample("mysite_db_connections_active"), active)
+
+
+@override_settings(SERVER_TIMING=True, PAGE_CACHE_ENABLED=True)
+class RequestTimingTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        from blog.models import Post
+
+        cache.clear()
+        user = User.objects.create_user(username="author", password="pw")
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(title="Timed", author=user, body="Body", published=True)
+
+    def timings(self, response):
+        entries = {}
+        for entry in response["Server-Timing"].split(", "):
+            name, *params = entry.split(";")
+            entries[name] = dict(param.split("=", 1) for param in params)
+        return entries
+
+    def sample(self, name, view):
+        return REGISTRY.get_sample_value(name, {"view": view}) or 0
+
+    def test_server_timing_counts_queries_cache_and_templates(self):
+        requests = self.sample("mysite_view_db_queries_count", "blog_index")
+        with CaptureQueriesContext(connections["default"]) as queries:
+            response = self.client.get("/blog/")
+
+        timings = self.timings(response)
+        self.assertEqual(timings["db"]["desc"], f'"{len(queries)} queries"')
+        # The page cache and the ETag both read the version; the page misses
+        self.assertEqual(timings["cache"]["desc"], '"2 hits / 1 misses"')
+        self.assertGreater(float(timings["tpl"]["dur"]), 0)
+        self.assertGreaterEqual(
+            float(timings["total"]["dur"]), float(timings["tpl"]["dur"])
+        )
+        self.assertEqual(
+            self.sample("mysite_view_db_queries_count", "blog_index"), requests + 1
+        )
+
+    def test_page_cache_hit_is_visible(self):
+        self.client.get("/blog/")
+        timings = self.timings(self.client.get("/blog/"))
+        self.assertEqual(timings["db"]["desc"], '"0 queries"')
+        self.assertEqual(timings["cache"]["desc"], '"2 hits / 0 misses"')
+
+    async def test_async_views_count_queries_in_orm_threads(self):
+        response = await self.async_client.get("/blog/")
+        queries = self.timings(response)["db"]["desc"]
+        self.assertNotEqual(queries, '"0 queries"')
+
+    @override_settings(SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        response = self.client.get("/blog/")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(QUERY_BUDGETS={"home": 0})
+    def test_query_budget_overrun_logged(self):
+        exceeded = self.sample("mysite_view_query_budget_exceeded_total", "home")
+        with self.assertLogs("apps.core.instrumentation", "WARNING") as logs:
+            self.client.get("/")
+        self.assertIn("home ran", logs.output[0])
+        self.assertEqual(
+            self.sample("mysite_view_query_budget_exceeded_total", "home"),
+            exceeded + 1,
+        )
+
+    def test_nothing_recorded_outside_requests(self):
+        from blog.models import Post
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            list(Post.objects.all())
+            cache.get("missing")
+        finally:
+            _current.reset(token)
+        list(Post.objects.all())
+        cache.get("missing")
+        self.assertEqual((stats.db_queries, stats.cache_misses), (1, 1))
+
+
+class SeedDataTest(TestCase):
+    def seed(self, **options):
+        out = StringIO()
+        call_command("seed_data", stdout=out, **options)
+        return out.getvalue()
+
+    def test_seeds_requested_volumes(self):
+        from django.contrib.auth.models import User
+
+        from blog.models import Post, Tag
+        from portfolio.models import Project
+
+        projects = Project.objects.count()
+        output = self.seed(posts=120, tags=8, projects=5, users=3, batch_size=50)
+        self.assertIn("Seeded 120 posts, 8 tags, 5 projects and 3 users", output)
+        self.assertEqual(Post.objects.count(), 120)
+        self.assertEqual(Tag.objects.count(), 8)
+        self.assertEqual(Project.objects.count(), projects + 5)
+        self.assertEqual(User.objects.filter(post__isnull=False).distinct().count(), 3)
+
+        post = Post.objects.first()
+        self.assertTrue(1 <= post.tags.count() <= 5)
+        self.assertEqual(post.word_count, len(post.body.split()))
+        self.assertTrue(post.body.startswith(post.excerpt.rstrip("…")))
+        self.assertLessEqual(post.created_at, post.updated_at)
+
+        # Denormalized counts match what the signals would have stored
+        for tag in Tag.objects.all():
+            self.assertEqual(
+                tag.post_count, tag.post_set.filter(published=True).count()
+            )
+
+        # New rows continue after the seeded ids
+        self.assertEqual(Post.objects.create(title="After", author=post.author).pk, 121)
+
+    def test_same_seed_same_content(self):
+        from blog.models import Post, Tag
+
+        def content():
+            return list(
+                Post.objects.order_by("created_at").values_list(
+                    "title", "body", "created_at", "published", "tags__name"
+                )
+            )
+
+        self.seed(posts=30, tags=5, seed=7)
+        first = content()
+        Post.objects.all().delete()
+        Tag.objects.all().delete()
+        self.seed(posts=30, tags=5, seed=7)
+        self.assertEqual(content(), first)
+
+        Post.objects.all().delete()
+        Tag.objects.all().delete()
+        self.seed(posts=30, tags=5, seed=8)
+        self.assertNotEqual(content(), first)
+
+    def test_tags_avoid_existing_names_and_slugs(self):
+        from blog.models import Tag
+
+        Tag.objects.create(name="Python")  # slug "python", as seeded
+        Tag.objects.create(name="django-1", slug="django")
+        self.seed(posts=0, tags=3)
+
+        self.assertEqual(Tag.objects.count(), 5)
+        self.assertEqual(
+            Tag.objects.values("slug").distinct().count(), Tag.objects.count()
+        )
+
+    def test_invalid_options(self):
+        with self.assertRaisesMessage(CommandError, "--posts cannot be negative"):
+            self.seed(posts=-1)
+        with self.assertRaisesMessage(CommandError, "one user"):
+            self.seed(posts=5, users=0)
+
+
+class BuildAssetsTest(SimpleTestCase):
+    htmx = b"/* htmx */"
+
+    def setUp(self):
+        self.base_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base_dir)
+        self.enterContext(override_settings(BASE_DIR=self.base_dir))
+        self.enterContext(patch.dict("os.environ", {"TAILWIND_CLI": "tailwindcss"}))
+        self.pin_htmx(hashlib.sha256(self.htmx).hexdigest())
+        self.urlopen = self.enterContext(
+            patch("urllib.request.urlopen", side_effect=self.fake_urlopen)
+        )
+
+    def pin_htmx(self, digest):
+        (self.base_dir / "assets").mkdir(exist_ok=True)
+        (self.base_dir / "assets" / "SHA256SUMS").write_text(
+            f"# pinned\n{digest}  {htmx_name()}\n"
+        )
+
+    def fake_urlopen(self, url, **kwargs):
+        if url == HTMX_URL.format(version=HTMX_VERSION):
+            return BytesIO(self.htmx)
+        return BytesIO(url.encode())
+
+    def fake_tailwind(self, command, **kwargs):
+        output = Path(command[command.index("--output") + 1])
+        output.write_text("body{margin:0}")
+        return subprocess.CompletedProcess(command, 0)
+
+    def build(self):
+        with patch("subprocess.run", side_effect=self.fake_tailwind) as run:
+            call_command("build_assets", stdout=StringIO())
+        return run
+
+    def test_builds_stylesheet_and_vendors_htmx(self):
+        self.build()
+        run = self.build()
+
+        command = run.call_args.args[0]
+        self.assertEqual(command[0], "tailwindcss")
+        self.assertIn("--minify", command)
+        self.assertEqual(
+            command[command.index("--input") + 1],
+            str(self.base_dir / "assets" / "tailwind.css"),
+        )
+        dist = self.base_dir / "static" / "dist"
+        self.assertEqual((dist / "site.css").read_text(), "body{margin:0}")
+        self.assertEqual((dist / "htmx.min.js").read_bytes(), self.htmx)
+        # The pinned htmx is downloaded once, then reused from the cache
+        self.assertEqual(self.urlopen.call_count, 1)
+
+    def test_rejects_download_not_matching_pinned_digest(self):
+        self.pin_htmx("0" * 64)
+        with self.assertRaisesMessage(CommandError, "SHA-256 mismatch"):
+            self.build()
+        self.assertEqual(list((self.base_dir / ".cache" / "assets").iterdir()), [])
+        self.assertFalse((self.base_dir / "static" / "dist" / "htmx.min.js").exists())
+
+    def test_rejects_download_without_pinned_digest(self):
+        (self.base_dir / "assets" / "SHA256SUMS").write_text("# nothing yet\n")
+        with self.assertRaisesMessage(CommandError, "No SHA-256 pinned"):
+            self.build()
+
+    def test_rejects_tampered_cache(self):
+        self.build()
+        (self.base_dir / ".cache" / "assets" / htmx_name()).write_bytes(b"evil")
+        with self.assertRaisesMessage(CommandError, "SHA-256 mismatch"):
+            self.build()
+        self.assertEqual(
+            (self.base_dir / "static" / "dist" / "htmx.min.js").read_bytes(),
+            self.htmx,
+        )
+
+    def test_pin_records_every_download(self):
+        call_command("build_assets", "--pin", stdout=StringIO())
+
+        sums = (self.base_dir / "assets" / "SHA256SUMS").read_text()
+        for name, url in pinned_downloads().items():
+            content = self.htmx if name == htmx_name() else url.encode()
+            self.assertIn(f"{hashlib.sha256(content).hexdigest()}  {name}", sums)
+
+    def test_if_pinned_skips_until_digests_pinned(self):
+        (self.base_dir / "assets" / "SHA256SUMS").write_text("# nothing yet\n")
+        out = StringIO()
+        with patch("subprocess.run") as run:
+            call_command("build_assets", "--if-pinned", stdout=out)
+        run.assert_not_called()
+        self.urlopen.assert_not_called()
+        self.assertIn("skipping", out.getvalue())
+
+    def test_tailwind_failure(self):
+        error = subprocess.CalledProcessError(1, "tailwindcss", stderr="bad config")
+        with patch("subprocess.run", side_effect=error):
+            with self.assertRaisesMessage(CommandError, "bad config"):
+                call_command("build_assets", stdout=StringIO())
+
+
+class StreamingResponseTest(SimpleTestCase):
+    def chunks(self):
+        try:
+            for i in range(10):
+                yield b"x" * 100
+        finally:
+            self.closed = True
+
+    def test_sync_iterator_kept_for_wsgi(self):
+        response = streaming_response(RequestFactory().get("/"), self.chunks())
+        self.assertFalse(response.is_async)
+        self.assertEqual(b"".join(response.streaming_content), b"x" * 1000)
+
+    async def test_async_batches_for_asgi(self):
+        request = AsyncRequestFactory().get("/")
+        response = streaming_response(request, self.chunks(), min_chunk_size=250)
+        self.assertTrue(response.is_async)
+        sizes = [len(chunk) async for chunk in response.streaming_content]
+        self.assertEqual(sizes, [300, 300, 300, 100])
+
+    async def test_async_closes_producer_on_disconnect(self):
+        self.closed = False
+        chunks = aiter_chunks(self.chunks(), min_size=0)
+        await anext(chunks)
+        await chunks.aclose()
+        self.assertTrue(self.closed)
@@ -0,0 +1,5 @@
+"""Cache keys shared by the blog views that read them and the signals, tasks,
+importer and seeder that invalidate them."""
+
+# Serialized tag list behind /api/blog/tags/, kept in the two-tier cache
+TAG_LIST_CACHE_KEY = "blog:tags"
@@ -0,0 +1,118 @@
+"""Streaming export of posts and projects as NDJSON or CSV.
+
+Rows are read with server-side cursors in chunks (tags prefetched once per
+chunk) and encoded one record at a time, so memory stays flat however large
+the archive. NDJSON records use the keys blog.importer reads, so an export
+can be imported into another site as-is.
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from portfolio.models import Project
+
+from .models import Post
+
+EXPORT_CHUNK_SIZE = 500
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_TYPES = ("all", "posts", "projects")
+CSV_COLUMNS = [
+    "type",
+    "title",
+    "slug",
+    "body",
+    "tags",
+    "published",
+    "author",
+    "description",
+    "link",
+    "github_link",
+    "featured",
+    "created_at",
+    "updated_at",
+]
+
+
+def post_records():
+    posts = (
+        Post.objects.select_related("author")
+        .prefetch_related("tags")
+        .defer("search_vector", "excerpt")
+        .order_by("pk")
+    )
+    for post in posts.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            "type": "post",
+            "title": post.title,
+            "slug": post.slug,
+            "body": post.body,
+            "tags": [tag.name for tag in post.tags.all()],
+            "published": post.published,
+            "author": post.author.username,
+            "created_at": post.created_at.isoformat(),
+            "updated_at": post.updated_at.isoformat(),
+        }
+
+
+def project_records():
+    projects = Project.objects.order_by("pk")
+    for project in projects.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            "type": "project",
+            "title": project.title,
+            "slug": project.slug,
+            "description": project.description,
+            "link": project.link,
+            "github_link": project.github_link,
+            "featured": project.featured,
+            "created_at": project.created_at.isoformat(),
+            "updated_at": project.updated_at.isoformat(),
+        }
+
+
+def export_records(content_type="all"):
+    if content_type in ("all", "posts"):
+        yield from post_records()
+    if content_type in ("all", "projects"):
+        yield from project_records()
+
+
+def encode_ndjson(records):
+    for record in records:
+        yield (json.dumps(record, ensure_ascii=False) + "\n").encode()
+
+
+def encode_csv(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        if "tags" in record:
+            record = {**record, "tags": ",".join(record["tags"])}
+        writer.writerow(record)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(fmt="ndjson", content_type="all", compress=False):
+    """Yield the encoded export as bytes chunks"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if content_type not in EXPORT_TYPES:
+        raise ValueError(f"Unknown content type: {content_type}")
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+    chunks = encode(export_records(content_type))
+    return gzip_stream(chunks) if compress else chunks
@@ -0,0 +1,218 @@
+import hashlib
+import io
+import logging
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from apps.core.page_cache import get_versions
+from apps.core.streaming import streaming_response
+
+from .models import Post, Tag
+
+logger = logging.getLogger(__name__)
+
+FEED_ITEMS = 50
+FEED_CHUNK_SIZE = 25
+FEED_TITLE = "My Site"
+
+
+class StreamingFeedMixin(ABC):
+    """Writes a feed one item at a time instead of building it in memory.
+
+    ``items`` is an iterable of ``add_item`` keyword dicts, consumed lazily,
+    so the caller can pass a queryset iterator and the first bytes go out
+    before the last post is loaded.
+    """
+
+    item_element = None
+
+    def __init__(self, items, updated, **kwargs):
+        super().__init__(**kwargs)
+        self._pending = items
+        self._updated = updated
+
+    def latest_post_date(self):
+        return self._updated
+
+    @abstractmethod
+    def start_document(self, handler):
+        """Open the root element(s)"""
+
+    @abstractmethod
+    def end_document(self, handler):
+        """Close what ``start_document`` opened"""
+
+    def stream(self):
+        buffer = io.StringIO()
+        handler = SimplerXMLGenerator(buffer, "utf-8", short_empty_elements=True)
+
+        def drain():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk.encode("utf-8")
+
+        handler.startDocument()
+        self.start_document(handler)
+        self.add_root_elements(handler)
+        yield drain()
+
+        for kwargs in self._pending:
+            # add_item fills in the defaults every item element expects
+            self.add_item(**kwargs)
+            item = self.items.pop()
+            handler.startElement(self.item_element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield drain()
+
+        self.end_document(handler)
+        yield drain()
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    item_element = "entry"
+
+    def start_document(self, handler):
+        handler.startElement("feed", self.root_attributes())
+
+    def end_document(self, handler):
+        handler.endElement("feed")
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    item_element = "item"
+
+    def start_document(self, handler):
+        handler.startElement("rss", self.rss_attributes())
+        handler.startElement("channel", self.root_attributes())
+
+    def end_document(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement("rss")
+
+
+FEED_FORMATS = {
+    "atom": StreamingAtomFeed,
+    "rss": StreamingRssFeed,
+}
+
+
+def _feed_posts(tag=None):
+    posts = Post.objects.published()
+    if tag is not None:
+        posts = posts.filter(tags=tag)
+    return posts
+
+
+def _post_item(request, post):
+    link = request.build_absolute_uri(reverse("blog_detail", args=[post.slug]))
+    return {
+        "title": post.title,
+        "link": link,
+        "description": post.excerpt,
+        "unique_id": link,
+        "author_name": post.author.get_full_name() or post.author.get_username(),
+        "pubdate": post.created_at,
+        "updateddate": post.updated_at,
+        "categories": [tag.name for tag in post.tags.all()],
+    }
+
+
+def build_feed(request, fmt, tag=None):
+    """Return a streaming feed of the latest published posts, optionally
+    limited to ``tag``."""
+    posts = _feed_posts(tag)
+    updated = posts.aggregate(updated=Max("updated_at"))["updated"] or timezone.now()
+    items = (
+        _post_item(request, post)
+        for post in posts.for_listing()
+        .order_by("-created_at", "-id")[:FEED_ITEMS]
+        .iterator(chunk_size=FEED_CHUNK_SIZE)
+    )
+
+    title = FEED_TITLE if tag is None else f"{FEED_TITLE}: {tag.name}"
+    return FEED_FORMATS[fmt](
+        items,
+        updated,
+        title=title,
+        link=request.build_absolute_uri(reverse("blog_index")),
+        description=f"Latest posts from {title}",
+        feed_url=request.build_absolute_uri(),
+        language=settings.LANGUAGE_CODE,
+    )
+
+
+def _feed_etag(request, fmt, tag_slug):
+    """Feed validators come from the page-cache versions, so answering a
+    conditional poll needs one cache read and no database query."""
+    dependencies = ["posts"] if tag_slug is None else ["posts", "tags"]
+    variant = "|".join(
+        [
+            request.get_host(),
+            fmt,
+            tag_slug or "",
+            *(str(version) for version in get_versions(dependencies)),
+        ]
+    )
+    return hashlib.md5(variant.encode()).hexdigest()
+
+
+def _caching_stream(chunks, key):
+    """Pass ``chunks`` through and store the whole document once streamed."""
+    body = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    try:
+        cache.set(key, b"".join(body), settings.PAGE_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Feed cache store failed: {e}")
+
+
+def feed_response(request, fmt, tag_slug=None):
+    """Serve a feed with an ETag, answering repeat polls with 304 and
+    otherwise from the cached document, streaming it when it is rebuilt."""
+    if fmt not in FEED_FORMATS:
+        raise Http404("Unknown feed format")
+    content_type = FEED_FORMATS[fmt].content_type
+
+    try:
+        digest = _feed_etag(request, fmt, tag_slug)
+        key, etag = f"feed:{digest}", f'"{digest}"'
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Feed cache unavailable: {e}")
+        key = etag = cached = None
+
+    if etag is not None:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+    if cached is not None:
+        response = HttpResponse(cached, content_type=content_type)
+    else:
+        tag = None if tag_slug is None else get_object_or_404(Tag, slug=tag_slug)
+        chunks = build_feed(request, fmt, tag).stream()
+        if key is not None and getattr(settings, "PAGE_CACHE_ENABLED", True):
+            chunks = _caching_stream(chunks, key)
+        # Each item goes out as soon as it is written
+        response = streaming_response(
+            request, chunks, min_chunk_size=0, content_type=content_type
+        )
+
+    if etag is not None:
+        response["ETag"] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,59 @@
+import django_filters
+from django.db.models import Count, Q
+
+from .models import Post, Tag
+
+
+class PostFilter(django_filters.FilterSet):
+    """``?tags=python,django&match=all|any`` with tags given by slug or ID"""
+
+    tags = django_filters.CharFilter(method="filter_tags")
+    match = django_filters.ChoiceFilter(
+        choices=[("any", "any"), ("all", "all")], method="filter_match"
+    )
+
+    class Meta:
+        model = Post
+        fields = ["tags", "match"]
+
+    def filter_match(self, queryset, name, value):
+        # Consumed by filter_tags
+        return queryset
+
+    def filter_tags(self, queryset, name, value):
+        values = {v.strip() for v in value.split(",") if v.strip()}
+        if not values:
+            return queryset
+
+        tag_match = Q(tag__slug__in=values)
+        ids = {int(v) for v in values if v.isdigit()}
+        if ids:
+            tag_match |= Q(tag_id__in=ids)
+
+        # One grouped subquery over the through table instead of a join per tag
+        post_ids = Post.tags.through.objects.filter(tag_match)
+        if self.form.cleaned_data.get("match") == "all":
+            tag_ids = self.resolve_tags(values, ids)
+            if tag_ids is None:
+                return queryset.none()
+            post_ids = (
+                post_ids.order_by()
+                .values("post_id")
+                .annotate(matched=Count("tag_id", distinct=True))
+                .filter(matched=len(tag_ids))
+            )
+        return queryset.filter(pk__in=post_ids.values("post_id"))
+
+    def resolve_tags(self, values, ids):
+        """IDs of the tags named by slug or ID in ``values``, counting a tag
+        named both ways once; None if any value names no tag"""
+        tags = dict(
+            Tag.objects.filter(Q(slug__in=values) | Q(pk__in=ids)).values_list(
+                "pk", "slug"
+            )
+        )
+        slugs = set(tags.values())
+        for value in values:
+            if value not in slugs and not (value.isdigit() and int(value) in tags):
+                return None
+        return set(tags)
@@ -0,0 +1,53 @@
+from apps.core.conditional import latest_update
+from apps.core.hot_queries import register
+
+from .models import Post, RelatedPost, Tag
+
+
+def _sample_slug(queryset):
+    return queryset.values_list("slug", flat=True).first() or ""
+
+
+@register("blog.published_listing")
+def published_listing():
+    """home, blog_index, PostListView and the feeds"""
+    return Post.objects.published().for_listing().order_by("-created_at", "-id")[:20]
+
+
+@register("blog.published_listing_after_cursor")
+def published_listing_after_cursor():
+    post = Post.objects.published().order_by("created_at").first()
+    queryset = Post.objects.published().for_listing()
+    if post is not None:
+        queryset = queryset.filter(created_at__lt=post.created_at)
+    return queryset.order_by("-created_at", "-id")[:20]
+
+
+@register("blog.published_detail")
+def published_detail():
+    slug = _sample_slug(Post.objects.published())
+    return Post.objects.with_related().filter(slug=slug, published=True)
+
+
+@register("blog.published_last_modified")
+def published_last_modified():
+    """The newest updated_at read by every collection ETag, built by the same
+    helper ``collection_version`` uses"""
+    return latest_update(Post.objects.published())
+
+
+@register("blog.tag_listing")
+def tag_listing():
+    slug = _sample_slug(Tag.objects.order_by("-post_count"))
+    return (
+        Post.objects.published()
+        .for_listing()
+        .filter(tags__slug=slug)
+        .order_by("-created_at", "-id")[:20]
+    )
+
+
+@register("blog.related_posts")
+def related_posts():
+    post_id = Post.objects.published().values_list("pk", flat=True).first()
+    return RelatedPost.objects.filter(post_id=post_id, related__published=True)
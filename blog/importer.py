@@ -0,0 +1,331 @@
+"""Bulk import of posts, tags and projects (see the import_content command).
+
+Records are dicts, read from Markdown files with front matter or from NDJSON,
+and written in batches: one bulk INSERT per model, set-based tag and author
+lookups, and slugs allocated in memory against the slugs already stored.
+bulk_create bypasses save() and signals, so ``finish()`` applies their side
+effects once for the whole import, or for the batches committed before a
+failing one.
+"""
+
+import json
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from apps.core.local_cache import invalidate_tiered_on_commit
+from apps.core.page_cache import invalidate_on_commit
+from portfolio.models import Project
+
+from .cache_keys import TAG_LIST_CACHE_KEY
+from .models import Post, Tag
+from .tasks import rebuild_related_posts
+
+DEFAULT_BATCH_SIZE = 1000
+TRUE_VALUES = {"true", "yes", "1", "on"}
+
+PostTag = Post.tags.through
+
+
+class InvalidRecord(ValueError):
+    pass
+
+
+class SlugAllocator:
+    """Hands out unique slugs for one model without a query per row.
+
+    All existing slugs are read once; collisions get a numeric suffix.
+    """
+
+    def __init__(self, model):
+        self.max_length = model._meta.get_field("slug").max_length
+        self.taken = set(
+            model.objects.values_list("slug", flat=True).iterator(chunk_size=5000)
+        )
+
+    def __contains__(self, slug):
+        return slug in self.taken
+
+    def allocate(self, text):
+        base = slugify(text)[: self.max_length] or "item"
+        slug, n = base, 1
+        while slug in self.taken:
+            n += 1
+            suffix = f"-{n}"
+            slug = f"{base[: self.max_length - len(suffix)]}{suffix}"
+        self.taken.add(slug)
+        return slug
+
+
+def _parse_value(value):
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [
+            item.strip().strip("\"'") for item in value[1:-1].split(",") if item.strip()
+        ]
+    return value.strip("\"'")
+
+
+def parse_markdown(text):
+    """Split ``key: value`` front matter between ``---`` lines from the body.
+
+    Lists are written ``[a, b]``; no other YAML syntax is supported.
+    """
+    record = {}
+    lines = text.splitlines()
+    if lines and lines[0].strip() == "---":
+        for index, line in enumerate(lines[1:], start=1):
+            if line.strip() == "---":
+                lines = lines[index + 1 :]
+                break
+            if ":" in line:
+                key, value = line.split(":", 1)
+                record[key.strip().lower()] = _parse_value(value)
+        else:
+            raise InvalidRecord("Front matter is not closed with ---")
+
+    body = "\n".join(lines).strip()
+    if "title" not in record and body.startswith("# "):
+        heading, _, body = body.partition("\n")
+        record["title"] = heading[2:].strip()
+        body = body.strip()
+    record["body"] = body
+    return record
+
+
+def read_markdown_dir(path):
+    """Records for every ``*.md`` file under ``path``. Without a ``slug`` in
+    the front matter, the slug comes from the file's path, so importing the
+    directory again skips files already imported."""
+    for file in sorted(Path(path).rglob("*.md")):
+        record = parse_markdown(file.read_text(encoding="utf-8"))
+        record.setdefault("title", file.stem.replace("-", " ").title())
+        name = file.relative_to(path).with_suffix("").as_posix()
+        record.setdefault("slug", name.replace("/", "-"))
+        yield record
+
+
+def read_ndjson(stream):
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise InvalidRecord(f"Line {number}: {e}") from e
+
+
+def _as_bool(value, default=False):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _as_datetime(value):
+    if not value or isinstance(value, datetime):
+        return value or None
+    parsed = parse_datetime(str(value))
+    if parsed is None:
+        raise InvalidRecord(f"Invalid date: {value}")
+    return parsed
+
+
+def _as_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+class ContentImporter:
+    """Writes records in batches; call ``run()`` then read the counters."""
+
+    def __init__(self, default_author=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.default_author = default_author
+        self.batch_size = batch_size
+        self.post_slugs = SlugAllocator(Post)
+        self.tag_slugs = SlugAllocator(Tag)
+        self.project_slugs = SlugAllocator(Project)
+        self.tags = {}
+        self.authors = {}
+        self.touched_tag_ids = set()
+        self.counts = {"posts": 0, "projects": 0, "tags": 0, "skipped": 0}
+
+    def run(self, records):
+        records = iter(records)
+        try:
+            while batch := list(islice(records, self.batch_size)):
+                committed = dict(self.counts), set(self.touched_tag_ids)
+                try:
+                    with transaction.atomic():
+                        self.import_batch(batch)
+                except Exception:
+                    # Forget what the rolled-back batch counted
+                    self.counts, self.touched_tag_ids = committed
+                    raise
+        finally:
+            # Batches committed before a failure are live and need this too
+            self.finish()
+        return self.counts
+
+    def import_batch(self, records):
+        posts, projects = [], []
+        for record in records:
+            kind = record.get("type", "post")
+            if kind == "post":
+                posts.append(record)
+            elif kind == "project":
+                projects.append(record)
+            else:
+                raise InvalidRecord(f"Unknown record type: {kind}")
+        if posts:
+            self.import_posts(posts)
+        if projects:
+            self.import_projects(projects)
+
+    def _slug(self, allocator, record):
+        """Explicit slugs already stored mean the record was imported before
+        and is skipped (None); otherwise a unique slug is allocated."""
+        slug = record.get("slug")
+        if slug:
+            slug = slugify(slug)
+            if slug in allocator:
+                return None
+            allocator.taken.add(slug)
+            return slug
+        return allocator.allocate(record["title"])
+
+    def _resolve_authors(self, usernames):
+        missing = set(usernames) - self.authors.keys()
+        if None in missing:
+            raise InvalidRecord("Post without an author and no default author")
+        if missing:
+            for user in User.objects.filter(username__in=missing):
+                self.authors[user.username] = user
+        unknown = missing - self.authors.keys()
+        if unknown:
+            raise InvalidRecord(f"Unknown authors: {', '.join(sorted(unknown))}")
+
+    def _resolve_tags(self, names):
+        """Map tag names to ids, creating missing tags with one INSERT"""
+        missing = set(names) - self.tags.keys()
+        if not missing:
+            return
+        for pk, name in Tag.objects.filter(name__in=missing).values_list("pk", "name"):
+            self.tags[name] = pk
+        new_tags = [
+            Tag(name=name, slug=self.tag_slugs.allocate(name))
+            for name in sorted(missing - self.tags.keys())
+        ]
+        for tag in Tag.objects.bulk_create(new_tags):
+            self.tags[tag.name] = tag.pk
+        self.counts["tags"] += len(new_tags)
+
+    def import_posts(self, records):
+        prepared = []
+        for record in records:
+            if not record.get("title"):
+                raise InvalidRecord(f"Post without a title: {record}")
+            slug = self._slug(self.post_slugs, record)
+            if slug is None:
+                self.counts["skipped"] += 1
+                continue
+            prepared.append((record, slug))
+
+        self._resolve_authors(
+            record.get("author") or self.default_author for record, _ in prepared
+        )
+        self._resolve_tags(
+            name for record, _ in prepared for name in _as_list(record.get("tags"))
+        )
+
+        posts, dates = [], []
+        for record, slug in prepared:
+            post = Post(
+                title=record["title"],
+                slug=slug,
+                body=record.get("body", ""),
+                author=self.authors[record.get("author") or self.default_author],
+                published=_as_bool(record.get("published"), default=True),
+            )
+            post.update_summary()
+            posts.append(post)
+            dates.append(
+                (
+                    _as_datetime(record.get("created_at")),
+                    _as_datetime(record.get("updated_at")),
+                )
+            )
+        Post.objects.bulk_create(posts, batch_size=self.batch_size)
+        self._restore_dates(Post, posts, dates)
+
+        links = []
+        for post, (record, _) in zip(posts, prepared):
+            tag_ids = {self.tags[name] for name in _as_list(record.get("tags"))}
+            links.extend(PostTag(post_id=post.pk, tag_id=tag_id) for tag_id in tag_ids)
+            if post.published:
+                self.touched_tag_ids.update(tag_ids)
+        PostTag.objects.bulk_create(links, batch_size=self.batch_size)
+        self.counts["posts"] += len(posts)
+
+    def import_projects(self, records):
+        projects, dates = [], []
+        for record in records:
+            if not record.get("title"):
+                raise InvalidRecord(f"Project without a title: {record}")
+            slug = self._slug(self.project_slugs, record)
+            if slug is None:
+                self.counts["skipped"] += 1
+                continue
+            projects.append(
+                Project(
+                    title=record["title"],
+                    slug=slug,
+                    description=record.get("description") or record.get("body", ""),
+                    link=record.get("link") or None,
+                    github_link=record.get("github_link") or None,
+                    featured=_as_bool(record.get("featured")),
+                )
+            )
+            dates.append(
+                (
+                    _as_datetime(record.get("created_at")),
+                    _as_datetime(record.get("updated_at")),
+                )
+            )
+        Project.objects.bulk_create(projects, batch_size=self.batch_size)
+        self._restore_dates(Project, projects, dates)
+        self.counts["projects"] += len(projects)
+
+    def _restore_dates(self, model, objs, dates):
+        """Apply imported timestamps, which auto_now(_add) overwrote on insert,
+        with one bulk UPDATE"""
+        dated = []
+        for obj, (created_at, updated_at) in zip(objs, dates):
+            if created_at or updated_at:
+                obj.created_at = created_at or obj.created_at
+                obj.updated_at = updated_at or created_at or obj.updated_at
+                dated.append(obj)
+        if dated:
+            model.objects.bulk_update(
+                dated, ["created_at", "updated_at"], batch_size=self.batch_size
+            )
+
+    def finish(self):
+        """What save() and the blog/portfolio signals would have done"""
+        if self.touched_tag_ids:
+            Tag.objects.filter(pk__in=self.touched_tag_ids).refresh_post_counts()
+        if self.counts["tags"] or self.touched_tag_ids:
+            invalidate_tiered_on_commit(TAG_LIST_CACHE_KEY)
+        if self.counts["posts"] or self.counts["tags"]:
+            invalidate_on_commit("posts", "tags")
+            transaction.on_commit(rebuild_related_posts.delay)
+        if self.counts["projects"]:
+            invalidate_on_commit("projects")
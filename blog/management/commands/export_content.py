@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.exporter import EXPORT_FORMATS, EXPORT_TYPES, export_stream
+
+
+class Command(BaseCommand):
+    help = "Stream posts and projects as NDJSON or CSV to a file or stdout"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=EXPORT_FORMATS, default="ndjson", dest="fmt"
+        )
+        parser.add_argument("--type", choices=EXPORT_TYPES, default="all")
+        parser.add_argument(
+            "--gzip", action="store_true", help="Gzip-compress the output"
+        )
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        chunks = export_stream(options["fmt"], options["type"], options["gzip"])
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(f"Exported to {options['output']}")
+            return
+
+        output = getattr(self.stdout, "buffer", None) or sys.stdout.buffer
+        for chunk in chunks:
+            output.write(chunk)
+        output.flush()
@@ -0,0 +1,67 @@
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.importer import (
+    DEFAULT_BATCH_SIZE,
+    ContentImporter,
+    InvalidRecord,
+    read_markdown_dir,
+    read_ndjson,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import posts, tags and projects from a directory of Markdown "
+        "files with front matter or from NDJSON (a file, or - for stdin)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Markdown directory, NDJSON file or -")
+        parser.add_argument(
+            "--author",
+            help="Username for posts that do not name an author",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Records per transaction and INSERT (default: {DEFAULT_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        importer = ContentImporter(
+            default_author=options["author"], batch_size=options["batch_size"]
+        )
+
+        started = time.perf_counter()
+        try:
+            if source == "-":
+                counts = importer.run(read_ndjson(sys.stdin))
+            elif Path(source).is_dir():
+                counts = importer.run(read_markdown_dir(source))
+            elif Path(source).is_file():
+                with open(source, encoding="utf-8") as stream:
+                    counts = importer.run(read_ndjson(stream))
+            else:
+                raise CommandError(f"No such file or directory: {source}")
+        except InvalidRecord as e:
+            raise CommandError(
+                f"Import stopped: {e} (batches before this one were committed; "
+                "re-running skips records whose slug is already stored)"
+            )
+        elapsed = time.perf_counter() - started
+
+        records = counts["posts"] + counts["projects"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {counts['posts']} posts, {counts['projects']} projects "
+                f"and {counts['tags']} new tags in {elapsed:.2f}s "
+                f"({records / elapsed if elapsed else records:.0f} records/s); "
+                f"skipped {counts['skipped']} existing"
+            )
+        )
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+BATCH_SIZE = 500
+
+
+def populate_summaries(apps, schema_editor):
+    """Populate excerpt, word count and reading time for existing posts,
+    one bulk UPDATE per chunk so only a chunk of posts is held in memory"""
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('id', 'body').iterator(chunk_size=BATCH_SIZE):
+        post.excerpt = Truncator(post.body).words(30)
+        post.word_count = len(post.body.split())
+        post.reading_time = max(1, -(-post.word_count // 200))
+        posts.append(post)
+        if len(posts) == BATCH_SIZE:
+            Post.objects.bulk_update(posts, ['excerpt', 'word_count', 'reading_time'])
+            posts = []
+    if posts:
+        Post.objects.bulk_update(posts, ['excerpt', 'word_count', 'reading_time'])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('blog', '0002_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_summaries,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
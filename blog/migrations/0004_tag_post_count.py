@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_post_counts(apps, schema_editor):
+    """Populate the published-post count for existing tags"""
+    Tag = apps.get_model('blog', 'Tag')
+    Post = apps.get_model('blog', 'Post')
+    counts = (
+        Post.tags.through.objects.filter(tag_id=OuterRef('pk'), post__published=True)
+        .order_by()
+        .values('tag_id')
+        .annotate(count=Count('post_id'))
+        .values('count')
+    )
+    Tag.objects.update(post_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('blog', '0003_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_post_counts,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
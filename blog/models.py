@@ -1,11 +1,37 @@
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.utils.text import slugify
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import Truncator, slugify
+
+EXCERPT_WORDS = 30
+WORDS_PER_MINUTE = 200
+
+
+class TagQuerySet(models.QuerySet):
+    def refresh_post_counts(self):
+        """Recompute the denormalized published-post count of these tags in
+        a single UPDATE."""
+        counts = (
+            Post.tags.through.objects.filter(
+                tag_id=OuterRef("pk"), post__published=True
+            )
+            .order_by()
+            .values("tag_id")
+            .annotate(count=Count("post_id"))
+            .values("count")
+        )
+        return self.update(post_count=Coalesce(Subquery(counts), 0))
 
 
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True, blank=True)
+    # Published posts with this tag, kept current by blog.signals
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = TagQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -19,6 +45,25 @@ class Tag(models.Model):
         ordering = ["name"]
 
 
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(published=True)
+
+    def with_related(self):
+        """Load the author and tags up front so rendering posts costs a
+        constant number of queries."""
+        return (
+            self.select_related("author")
+            .prefetch_related("tags")
+            .defer("search_vector")
+        )
+
+    def for_listing(self):
+        """Like with_related() but leaves the body in the database; list pages
+        only render the stored excerpt."""
+        return self.with_related().defer("body")
+
+
 class Post(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
@@ -28,6 +73,13 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published = models.BooleanField(default=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=1, editable=False)
+    # Maintained by a database trigger on PostgreSQL (see migration 0002)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -35,10 +87,65 @@ class Post(models.Model):
         else:
             # Ensure existing slug is properly sanitized
             self.slug = slugify(self.slug)
+        self.update_summary()
         super().save(*args, **kwargs)
 
+    def update_summary(self):
+        """Recompute the stored excerpt, word count and reading time (minutes)"""
+        self.excerpt = Truncator(self.body).words(EXCERPT_WORDS)
+        self.word_count = len(self.body.split())
+        self.reading_time = max(1, -(-self.word_count // WORDS_PER_MINUTE))
+
+    def _related_entries(self):
+        return (
+            RelatedPost.objects.filter(post_id=self.pk, related__published=True)
+            .select_related("related")
+            .defer("related__body", "related__search_vector")
+        )
+
+    def related_posts(self):
+        """Published related posts in score order: one indexed lookup"""
+        return [entry.related for entry in self._related_entries()]
+
+    async def arelated_posts(self):
+        return [entry.related async for entry in self._related_entries()]
+
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Newest-first listings of published posts (home, blog index,
+            # API, feeds) and their keyset cursors
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(published=True),
+                name="blog_post_pub_created_idx",
+            ),
+            # MAX(updated_at) behind the collection ETags
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(published=True),
+                name="blog_post_pub_updated_idx",
+            ),
+        ]
+
+
+class RelatedPost(models.Model):
+    """Precomputed nearest neighbours of a post (see blog.related)"""
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="related_entries"
+    )
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    position = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["post", "position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "position"], name="blog_relatedpost_post_position"
+            ),
+        ]
@@ -0,0 +1,142 @@
+"""Related-posts index: top-N neighbours of each post by tag overlap.
+
+score = TAG_WEIGHT * jaccard(tags) + RECENCY_WEIGHT * 0.5 ** (age / half-life)
+
+Neighbour lists are stored in RelatedPost so detail pages read them with a
+single indexed lookup. The blog.tasks Celery tasks keep them up to date.
+"""
+
+import math
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from apps.core.page_cache import invalidate
+
+from .models import Post, RelatedPost
+
+RELATED_POSTS_COUNT = 5
+TAG_WEIGHT = 0.8
+RECENCY_WEIGHT = 0.2
+RECENCY_HALF_LIFE_DAYS = 180
+
+PostTag = Post.tags.through
+
+
+def score(shared, tag_count, candidate_tag_count, age_days):
+    jaccard = shared / (tag_count + candidate_tag_count - shared)
+    recency = math.pow(0.5, max(age_days, 0) / RECENCY_HALF_LIFE_DAYS)
+    return TAG_WEIGHT * jaccard + RECENCY_WEIGHT * recency
+
+
+def compute_related(post_id, limit=RELATED_POSTS_COUNT):
+    """Return [(related_post_id, score), ...] best first for ``post_id``"""
+    tag_ids = list(
+        PostTag.objects.filter(post_id=post_id).values_list("tag_id", flat=True)
+    )
+    if not tag_ids:
+        return []
+
+    shared = dict(
+        PostTag.objects.filter(tag_id__in=tag_ids, post__published=True)
+        .exclude(post_id=post_id)
+        .order_by()
+        .values("post_id")
+        .annotate(shared=Count("tag_id"))
+        .values_list("post_id", "shared")
+    )
+    if not shared:
+        return []
+
+    candidates = (
+        Post.objects.filter(pk__in=shared)
+        .order_by()
+        .annotate(tag_count=Count("tags"))
+        .values_list("pk", "tag_count", "created_at")
+    )
+    now = timezone.now()
+    scored = [
+        (
+            pk,
+            score(shared[pk], len(tag_ids), tag_count, (now - created_at).days),
+        )
+        for pk, tag_count, created_at in candidates
+    ]
+    scored.sort(key=lambda item: (-item[1], -item[0]))
+    return scored[:limit]
+
+
+def update_related(post_id):
+    """Recompute and store the neighbour list of one post"""
+    entries = [
+        RelatedPost(post_id=post_id, related_id=related_id, score=value, position=i)
+        for i, (related_id, value) in enumerate(compute_related(post_id))
+    ]
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id=post_id).delete()
+        RelatedPost.objects.bulk_create(entries)
+
+    slug = Post.objects.filter(pk=post_id).values_list("slug", flat=True).first()
+    if slug:
+        invalidate(f"post:{slug}")
+
+
+def posts_affected_by_tag_change(post_id, tag_ids):
+    """Posts whose neighbour lists can change when ``tag_ids`` are added to or
+    removed from ``post_id``: the post itself, posts that currently list it,
+    and posts sharing those tags for which it now scores at least as high as
+    the last entry of their full list (or whose list has room).
+
+    Posts it cannot enter are left alone, so a popular tag does not fan out
+    to every post carrying it. Thresholds are the stored scores, which the
+    nightly rebuild_related_posts refreshes as recency drifts.
+    """
+    affected = {post_id}
+    affected.update(
+        RelatedPost.objects.filter(related_id=post_id).values_list("post_id", flat=True)
+    )
+    # Unpublished or untagged posts are nobody's neighbour
+    created_at = (
+        Post.objects.filter(pk=post_id, published=True)
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    post_tags = list(
+        PostTag.objects.filter(post_id=post_id).values_list("tag_id", flat=True)
+    )
+    if created_at is None or not post_tags:
+        return affected
+
+    sharing = PostTag.objects.filter(tag_id__in=tag_ids).values("post_id")
+    candidates = (
+        Post.objects.filter(pk__in=sharing)
+        .exclude(pk__in=affected)
+        .order_by()
+        .annotate(
+            tag_count=Count("tags", distinct=True),
+            shared=Count("tags", filter=Q(tags__in=post_tags), distinct=True),
+        )
+        .filter(shared__gt=0)
+        .values_list("pk", "tag_count", "shared")
+    )
+    age_days = (timezone.now() - created_at).days
+    scores = {
+        pk: score(shared, tag_count, len(post_tags), age_days)
+        for pk, tag_count, shared in candidates
+    }
+    # Lowest stored score of each candidate whose list is full
+    thresholds = dict(
+        RelatedPost.objects.filter(post_id__in=scores)
+        .order_by()
+        .values("post_id")
+        .annotate(entries=Count("pk"), lowest=Min("score"))
+        .filter(entries__gte=RELATED_POSTS_COUNT)
+        .values_list("post_id", "lowest")
+    )
+    affected.update(
+        pk
+        for pk, value in scores.items()
+        if pk not in thresholds or value >= thresholds[pk]
+    )
+    return affected
@@ -0,0 +1,80 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Substr
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from rest_framework.filters import SearchFilter
+
+# Text search configuration used by the search_vector trigger (see migration 0002)
+SEARCH_CONFIG = "english"
+
+# Sentinels wrapped around matches by ts_headline; swapped for <mark> after the
+# snippet has been HTML-escaped so post bodies can never inject markup.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+
+def supports_full_text(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_posts(queryset, terms):
+    """Filter posts matching ``terms``, annotated with ``rank`` and ``headline``
+    and ordered best match first.
+
+    Uses the GIN-indexed ``search_vector`` on PostgreSQL and falls back to a
+    case-insensitive match on other databases (SQLite in tests).
+    """
+    terms = terms.strip()
+    if not terms:
+        return queryset.none()
+
+    if not supports_full_text(queryset):
+        return (
+            queryset.filter(Q(title__icontains=terms) | Q(body__icontains=terms))
+            .annotate(
+                rank=Value(0.0, output_field=FloatField()),
+                headline=Substr("body", 1, 200),
+            )
+            .order_by("-created_at")
+        )
+
+    query = SearchQuery(terms, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            headline=SearchHeadline(
+                "body",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        .order_by("-rank", "-created_at")
+    )
+
+
+def highlight(headline):
+    """Return an HTML-safe snippet with matched terms wrapped in <mark>."""
+    snippet = escape(headline or "")
+    snippet = snippet.replace(HIGHLIGHT_START, "<mark>")
+    snippet = snippet.replace(HIGHLIGHT_STOP, "</mark>")
+    return mark_safe(snippet)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """SearchFilter that uses the full-text index instead of ILIKE scans."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = " ".join(self.get_search_terms(request))
+        if not terms:
+            return queryset
+        if not supports_full_text(queryset):
+            return super().filter_queryset(request, queryset, view)
+        query = SearchQuery(terms, search_type="websearch", config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query)
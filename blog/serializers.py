@@ -1,12 +1,13 @@
 from rest_framework import serializers
 
 from .models import Post, Tag
+from .search import highlight
 
 
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
-        fields = ["id", "name", "slug"]
+        fields = ["id", "name", "slug", "post_count"]
 
 
 class PostSerializer(serializers.ModelSerializer):
@@ -20,8 +21,29 @@ class PostSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "body",
+            "excerpt",
+            "word_count",
+            "reading_time",
             "tags",
             "author",
             "created_at",
             "updated_at",
         ]
+
+
+class PostListSerializer(PostSerializer):
+    """Post summary for list endpoints; the full body is only on the detail"""
+
+    class Meta(PostSerializer.Meta):
+        fields = [field for field in PostSerializer.Meta.fields if field != "body"]
+
+
+class PostSearchSerializer(PostListSerializer):
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.SerializerMethodField()
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ["rank", "headline"]
+
+    def get_headline(self, obj):
+        return str(highlight(obj.headline))
@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from apps.core.local_cache import invalidate_tiered_on_commit
+from apps.core.page_cache import invalidate_on_commit
+
+from .cache_keys import TAG_LIST_CACHE_KEY
+from .models import Post, RelatedPost, Tag
+from .tasks import refresh_related_posts, update_related_posts
+
+
+def schedule_related_refresh(post_id, tag_ids):
+    """Recompute related-post lists touched by a tag change once committed"""
+    tag_ids = list(tag_ids)
+    if tag_ids:
+        transaction.on_commit(lambda: refresh_related_posts.delay(post_id, tag_ids))
+
+
+def refresh_tag_counts(tag_ids):
+    """Recompute post counts for ``tag_ids`` and drop the cached tag list"""
+    tag_ids = list(tag_ids)
+    if tag_ids:
+        Tag.objects.filter(pk__in=tag_ids).refresh_post_counts()
+        invalidate_tiered_on_commit(TAG_LIST_CACHE_KEY)
+
+
+def listing_posts(post_id):
+    """(pk, slug) of the posts whose related list links to ``post_id``"""
+    return list(
+        RelatedPost.objects.filter(related_id=post_id).values_list(
+            "post_id", "post__slug"
+        )
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_state(sender, instance, **kwargs):
+    """Keep the stored slug, title and published flag so post_save can tell
+    what changed: a renamed post also drops its old page and the pages
+    linking to it, and publishing or unpublishing changes tag counts."""
+    previous = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list("slug", "title", "published")
+        .first()
+        if instance.pk
+        else None
+    )
+    (
+        instance._previous_slug,
+        instance._previous_title,
+        instance._previous_published,
+    ) = previous or (None, None, None)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    slugs = {instance.slug, getattr(instance, "_previous_slug", None)}
+    invalidate_on_commit("posts", *(f"post:{slug}" for slug in slugs if slug))
+
+
+@receiver(post_save, sender=Post)
+def invalidate_listing_pages_on_rename(sender, instance, created, **kwargs):
+    """Related lists show the title and link to the slug of each neighbour"""
+    previous = (
+        getattr(instance, "_previous_slug", None),
+        getattr(instance, "_previous_title", None),
+    )
+    if created or previous == (instance.slug, instance.title):
+        return
+    if listed_by := listing_posts(instance.pk):
+        invalidate_on_commit(*(f"post:{slug}" for _, slug in listed_by))
+
+
+@receiver(post_save, sender=Post)
+def refresh_counts_on_publish(sender, instance, created, **kwargs):
+    previous_published = getattr(instance, "_previous_published", None)
+    if not created and instance.published != previous_published:
+        tag_ids = list(instance.tags.values_list("pk", flat=True))
+        refresh_tag_counts(tag_ids)
+        schedule_related_refresh(instance.pk, tag_ids)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post_tags(sender, instance, **kwargs):
+    instance._tag_ids = (
+        list(instance.tags.values_list("pk", flat=True)) if instance.published else []
+    )
+    # Read before the delete cascades to their RelatedPost rows
+    instance._listed_by = listing_posts(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def refresh_counts_on_delete(sender, instance, **kwargs):
+    refresh_tag_counts(getattr(instance, "_tag_ids", []))
+
+
+@receiver(post_delete, sender=Post)
+def refresh_listing_posts_on_delete(sender, instance, **kwargs):
+    """Posts that listed the deleted post drop its link now and refill their
+    list in the background"""
+    listed_by = getattr(instance, "_listed_by", [])
+    if listed_by:
+        invalidate_on_commit(*(f"post:{slug}" for _, slug in listed_by))
+        post_ids = [pk for pk, _ in listed_by]
+        transaction.on_commit(lambda: update_related_posts.delay(post_ids))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and not reverse:
+        instance._cleared_tag_ids = list(instance.tags.values_list("pk", flat=True))
+    if not action.startswith("post_"):
+        return
+
+    if reverse:
+        # Changed from the Tag side: tag.post_set.add(...)
+        invalidate_on_commit("posts", "tags")
+        refresh_tag_counts([instance.pk])
+        for post_id in pk_set or []:
+            schedule_related_refresh(post_id, [instance.pk])
+        return
+
+    invalidate_on_commit("posts", f"post:{instance.slug}")
+    if action == "post_clear":
+        tag_ids = getattr(instance, "_cleared_tag_ids", [])
+    else:
+        tag_ids = pk_set or []
+    if instance.published:
+        refresh_tag_counts(tag_ids)
+    schedule_related_refresh(instance.pk, tag_ids)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_pages(sender, instance, **kwargs):
+    invalidate_on_commit("posts", "tags")
+    invalidate_tiered_on_commit(TAG_LIST_CACHE_KEY)
@@ -1,7 +1,11 @@
 from celery import shared_task
 from django.core.mail import send_mail
 
-from .models import Post
+from apps.core.local_cache import invalidate_tiered
+
+from .cache_keys import TAG_LIST_CACHE_KEY
+from .models import Post, Tag
+from .related import posts_affected_by_tag_change, update_related
 
 
 @shared_task
@@ -18,3 +22,42 @@ def send_post_notification(post_id):
         return f"Notification sent for post: {post.title}"
     except Post.DoesNotExist:
         return f"Post with id {post_id} not found"
+
+
+@shared_task
+def refresh_tag_post_counts():
+    """Reconcile every tag's post count, e.g. after bulk updates that bypass
+    signals"""
+    updated = Tag.objects.all().refresh_post_counts()
+    invalidate_tiered(TAG_LIST_CACHE_KEY)
+    return f"Refreshed post counts for {updated} tags"
+
+
+@shared_task
+def refresh_related_posts(post_id, tag_ids):
+    """Update neighbour lists after ``tag_ids`` were added to or removed from
+    a post"""
+    affected = posts_affected_by_tag_change(post_id, tag_ids)
+    for affected_id in affected:
+        update_related(affected_id)
+    return f"Updated related posts for {len(affected)} posts"
+
+
+@shared_task
+def update_related_posts(post_ids):
+    """Recompute the neighbour lists of ``post_ids``, e.g. the posts that
+    listed a deleted post"""
+    for post_id in post_ids:
+        update_related(post_id)
+    return f"Updated related posts for {len(post_ids)} posts"
+
+
+@shared_task
+def rebuild_related_posts():
+    """Recompute every published post's neighbour list (recency drifts daily)"""
+    count = 0
+    post_ids = Post.objects.filter(published=True).values_list("pk", flat=True)
+    for post_id in post_ids.iterator(chunk_size=1000):
+        update_related(post_id)
+        count += 1
+    return f"Rebuilt related posts for {count} posts"
@@ -1,9 +1,28 @@
+import csv
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from .models import Post, Tag
+from portfolio.models import Project
+
+from .importer import parse_markdown
+from .models import Post, RelatedPost, Tag
+from .related import posts_affected_by_tag_change, update_related
+from .search import HIGHLIGHT_START, HIGHLIGHT_STOP, highlight
+from .tasks import refresh_related_posts
 
 
 class BlogModelTest(TestCase):
@@ -28,6 +47,16 @@ class BlogModelTest(TestCase):
         self.assertEqual(post.slug, "test-post")
         self.assertTrue(post.published)
 
+    def test_post_summary_computed_on_save(self):
+        post = Post.objects.create(
+            title="Long Post",
+            body=" ".join(["word"] * 450),
+            author=self.user,
+        )
+        self.assertEqual(post.word_count, 450)
+        self.assertEqual(post.reading_time, 3)
+        self.assertEqual(post.excerpt, " ".join(["word"] * 30) + "…")
+
 
 class BlogAPITest(APITestCase):
     def setUp(self):
@@ -47,8 +76,478 @@ class BlogAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_post_list_omits_body(self):
+        response = self.client.get("/api/blog/posts/")
+        result = response.data["results"][0]
+        self.assertNotIn("body", result)
+        self.assertEqual(result["excerpt"], "This is a test post.")
+
     def test_get_post_detail(self):
         url = f"/api/blog/posts/{self.post.slug}/"
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["title"], "Test Post")
+        self.assertEqual(response.data["body"], "This is a test post.")
+
+    def test_post_detail_conditional_get(self):
+        url = f"/api/blog/posts/{self.post.slug}/"
+        response = self.client.get(url)
+        self.assertIn("ETag", response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @patch("blog.signals.refresh_related_posts.delay")
+    def test_post_detail_etag_changes_when_tag_added(self, refresh_related):
+        url = f"/api/blog/posts/{self.post.slug}/"
+        etag = self.client.get(url)["ETag"]
+
+        tag = Tag.objects.create(name="Added Later", slug="added-later")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.tags.add(tag)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Added Later", [t["name"] for t in response.data["tags"]])
+
+    def test_post_list_uses_cursor_pagination(self):
+        for i in range(25):
+            Post.objects.create(
+                title=f"Extra Post {i}",
+                body="More content.",
+                author=self.user,
+                published=True,
+            )
+
+        response = self.client.get("/api/blog/posts/")
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIn("cursor=", response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertIsNone(response.data["next"])
+
+    def test_post_list_query_count_is_constant(self):
+        url = "/api/blog/posts/"
+        tag = Tag.objects.create(name="Python")
+        self.post.tags.add(tag)
+
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(url)
+
+        for i in range(10):
+            post = Post.objects.create(
+                title=f"Extra Post {i}",
+                body="More content.",
+                author=self.user,
+                published=True,
+            )
+            post.tags.add(tag)
+
+        with CaptureQueriesContext(connection) as larger:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 11)
+        self.assertEqual(len(larger), len(baseline))
+
+
+class BlogSearchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        Post.objects.create(
+            title="Signals on the main line",
+            body="Notes on railway signalling.",
+            author=self.user,
+            published=True,
+        )
+        Post.objects.create(
+            title="Django tips",
+            body="Querysets and templates.",
+            author=self.user,
+            published=True,
+        )
+        Post.objects.create(
+            title="Draft about railway",
+            body="Not yet published.",
+            author=self.user,
+            published=False,
+        )
+
+    def test_search_returns_matching_published_posts(self):
+        response = self.client.get("/api/blog/search/", {"q": "railway"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [post["title"] for post in response.data["results"]]
+        self.assertEqual(titles, ["Signals on the main line"])
+        self.assertIn("headline", response.data["results"][0])
+        self.assertIn("rank", response.data["results"][0])
+
+    def test_search_without_query_returns_nothing(self):
+        response = self.client.get("/api/blog/search/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    def test_highlight_escapes_body_markup(self):
+        snippet = highlight(f"<b>{HIGHLIGHT_START}rail{HIGHLIGHT_STOP}</b>")
+        self.assertEqual(snippet, "&lt;b&gt;<mark>rail</mark>&lt;/b&gt;")
+
+
+class TagListAPITest(APITestCase):
+    def setUp(self):
+        from apps.core.local_cache import local_cache
+
+        cache.clear()
+        local_cache.clear()
+        Tag.objects.create(name="Python")
+
+    def names(self, response):
+        return [tag["name"] for tag in response.data["results"]]
+
+    def test_tag_list_reflects_changes(self):
+        response = self.client.get("/api/blog/tags/")
+        self.assertEqual(self.names(response), ["Python"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name="Django")
+        response = self.client.get("/api/blog/tags/")
+        self.assertEqual(self.names(response), ["Django", "Python"])
+
+    def test_tag_list_keeps_pagination(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(25):
+                Tag.objects.create(name=f"Tag {i:02}")
+
+        response = self.client.get("/api/blog/tags/")
+        self.assertEqual(response.data["count"], 26)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertIsNone(response.data["next"])
+
+
+class TagCountAndFilterTest(APITestCase):
+    def setUp(self):
+        from apps.core.local_cache import local_cache
+
+        cache.clear()
+        local_cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.python = Tag.objects.create(name="Python")
+        self.django = Tag.objects.create(name="Django")
+        self.both = self.create_post("Both", self.python, self.django)
+        self.python_only = self.create_post("Python Only", self.python)
+        self.draft = self.create_post("Draft", self.python, published=False)
+
+    def create_post(self, title, *tags, published=True):
+        post = Post.objects.create(
+            title=title, body="Body", author=self.user, published=published
+        )
+        post.tags.add(*tags)
+        return post
+
+    def counts(self):
+        return dict(Tag.objects.values_list("name", "post_count"))
+
+    def test_post_counts_track_published_posts(self):
+        self.assertEqual(self.counts(), {"Python": 2, "Django": 1})
+
+        self.draft.published = True
+        self.draft.save()
+        self.assertEqual(self.counts()["Python"], 3)
+
+        self.both.tags.remove(self.django)
+        self.assertEqual(self.counts()["Django"], 0)
+
+        self.python_only.tags.clear()
+        self.both.delete()
+        self.assertEqual(self.counts()["Python"], 1)
+
+    def test_tag_list_includes_counts(self):
+        response = self.client.get("/api/blog/tags/")
+        counts = {tag["slug"]: tag["post_count"] for tag in response.data["results"]}
+        self.assertEqual(counts, {"django": 1, "python": 2})
+
+    def test_filter_any_tags(self):
+        response = self.client.get("/api/blog/posts/", {"tags": "python,django"})
+        titles = {post["title"] for post in response.data["results"]}
+        self.assertEqual(titles, {"Both", "Python Only"})
+
+    def test_filter_all_tags(self):
+        response = self.client.get(
+            "/api/blog/posts/", {"tags": "python,django", "match": "all"}
+        )
+        titles = [post["title"] for post in response.data["results"]]
+        self.assertEqual(titles, ["Both"])
+
+    def test_match_all_counts_tag_named_twice_once(self):
+        response = self.client.get(
+            "/api/blog/posts/",
+            {"tags": f"python,{self.python.pk},django", "match": "all"},
+        )
+        titles = [post["title"] for post in response.data["results"]]
+        self.assertEqual(titles, ["Both"])
+
+    def test_match_all_with_unknown_tag(self):
+        response = self.client.get(
+            "/api/blog/posts/", {"tags": "python,nope", "match": "all"}
+        )
+        self.assertEqual(response.data["results"], [])
+
+    def test_filter_by_tag_id(self):
+        response = self.client.get("/api/blog/posts/", {"tags": self.django.pk})
+        titles = [post["title"] for post in response.data["results"]]
+        self.assertEqual(titles, ["Both"])
+
+
+class RelatedPostsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.python, self.django, self.celery = (
+            Tag.objects.create(name=name) for name in ["Python", "Django", "Celery"]
+        )
+        self.post = self.create_post("Source", self.python, self.django)
+        self.close = self.create_post("Close", self.python, self.django)
+        self.partial = self.create_post("Partial", self.python, self.celery)
+        self.unrelated = self.create_post("Unrelated", self.celery)
+
+    def create_post(self, title, *tags):
+        post = Post.objects.create(
+            title=title, body="Body", author=self.user, published=True
+        )
+        post.tags.add(*tags)
+        return post
+
+    def test_neighbours_ranked_by_tag_overlap(self):
+        update_related(self.post.pk)
+        self.assertEqual(self.post.related_posts(), [self.close, self.partial])
+
+    def test_unpublished_neighbours_hidden(self):
+        update_related(self.post.pk)
+        self.close.published = False
+        self.close.save()
+        self.assertEqual(self.post.related_posts(), [self.partial])
+
+    def test_tag_change_refreshes_affected_posts(self):
+        with patch("blog.signals.refresh_related_posts.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.unrelated.tags.add(self.django)
+        delay.assert_called_once_with(self.unrelated.pk, [self.django.pk])
+
+        refresh_related_posts(self.unrelated.pk, [self.django.pk])
+        self.assertIn(self.unrelated, self.post.related_posts())
+        self.assertIn(self.post, self.unrelated.related_posts())
+
+    def test_tag_change_skips_posts_it_cannot_enter(self):
+        newcomer = self.create_post("Newcomer", self.celery)
+        # Partial's list is full of neighbours scoring above the newcomer
+        RelatedPost.objects.create(
+            post=self.partial, related=self.close, score=1.0, position=0
+        )
+        with patch("blog.related.RELATED_POSTS_COUNT", 1):
+            affected = posts_affected_by_tag_change(newcomer.pk, [self.celery.pk])
+        self.assertEqual(affected, {newcomer.pk, self.unrelated.pk})
+
+    def test_tag_change_refreshes_posts_listing_it(self):
+        update_related(self.close.pk)
+        self.post.tags.remove(self.python, self.django)
+        affected = posts_affected_by_tag_change(
+            self.post.pk, [self.python.pk, self.django.pk]
+        )
+        self.assertEqual(affected, {self.post.pk, self.close.pk})
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_deleting_neighbour_refreshes_pages_listing_it(self):
+        cache.clear()
+        update_related(self.post.pk)
+        self.assertContains(self.client.get(f"/blog/{self.post.slug}/"), "Close")
+
+        with patch("blog.signals.update_related_posts.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.close.delete()
+        delay.assert_called_once_with([self.post.pk])
+        response = self.client.get(f"/blog/{self.post.slug}/")
+        self.assertNotContains(response, "Close")
+        self.assertContains(response, "Partial")
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_renaming_neighbour_refreshes_pages_listing_it(self):
+        cache.clear()
+        update_related(self.post.pk)
+        self.assertContains(self.client.get(f"/blog/{self.post.slug}/"), "Close")
+        response = self.client.get(f"/blog/{self.post.slug}/")
+        self.assertEqual(response["X-Page-Cache"], "hit")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.close.title = "Renamed"
+            self.close.save()
+        self.assertContains(self.client.get(f"/blog/{self.post.slug}/"), "Renamed")
+
+    def test_detail_page_shows_related_posts(self):
+        update_related(self.post.pk)
+        response = self.client.get(f"/blog/{self.post.slug}/")
+        self.assertContains(response, "Related Posts")
+        self.assertContains(response, "Close")
+
+
+class ImportContentTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="writer", password="pass")
+        Tag.objects.create(name="Django")
+        Post.objects.create(
+            title="Existing", slug="hello-world", author=self.user, body="Old"
+        )
+
+    def import_ndjson(self, records, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "content.ndjson"
+            path.write_text("\n".join(json.dumps(record) for record in records))
+            out = StringIO()
+            call_command("import_content", str(path), *args, stdout=out)
+        return out.getvalue()
+
+    def test_ndjson_import_batches_queries(self):
+        """Test that query count depends on batches, not records"""
+        records = [
+            {
+                "title": "Hello World",
+                "body": "word " * 400,
+                "tags": ["Django", f"Tag {i % 3}"],
+                "created_at": "2020-01-0%dT12:00:00Z" % (i + 1),
+            }
+            for i in range(6)
+        ]
+        records.append({"type": "project", "title": "Tool", "description": "Desc"})
+
+        with CaptureQueriesContext(connection) as queries:
+            output = self.import_ndjson(records, "--author=writer")
+        self.assertIn("Imported 6 posts, 1 projects and 3 new tags", output)
+        self.assertLess(len(queries), 25)
+
+        slugs = set(Post.objects.values_list("slug", flat=True))
+        self.assertEqual(len(slugs), 7)
+        self.assertIn("hello-world-2", slugs)
+        post = Post.objects.get(slug="hello-world-2")
+        self.assertEqual(post.created_at.day, 1)
+        self.assertEqual(post.reading_time, 2)
+        self.assertTrue(Project.objects.filter(slug="tool").exists())
+        self.assertEqual(Tag.objects.get(name="Django").post_count, 6)
+
+    def test_explicit_slugs_skipped_on_reimport(self):
+        records = [{"title": "Once", "slug": "once", "body": "Body"}]
+        self.import_ndjson(records, "--author=writer")
+        output = self.import_ndjson(records, "--author=writer")
+        self.assertIn("skipped 1 existing", output)
+        self.assertEqual(Post.objects.filter(slug__startswith="once").count(), 1)
+
+    def test_markdown_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "from-markdown.md").write_text(
+                "---\ntitle: From Markdown\ntags: [Django, Notes]\n"
+                "published: false\nauthor: writer\n---\nBody text\n"
+            )
+            call_command("import_content", tmp, stdout=StringIO())
+
+        post = Post.objects.get(slug="from-markdown")
+        self.assertFalse(post.published)
+        self.assertEqual(post.body, "Body text")
+        self.assertEqual(post.tags.count(), 2)
+        self.assertEqual(Tag.objects.get(name="Notes").post_count, 0)
+
+    def test_markdown_reimport_skips_files_without_slug(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "2024").mkdir()
+            (Path(tmp) / "2024" / "notes.md").write_text("# Notes\n\nBody\n")
+            call_command("import_content", tmp, "--author=writer", stdout=StringIO())
+            out = StringIO()
+            call_command("import_content", tmp, "--author=writer", stdout=out)
+
+        self.assertIn("skipped 1 existing", out.getvalue())
+        self.assertEqual(Post.objects.filter(title="Notes").get().slug, "2024-notes")
+
+    def test_failed_batch_still_finishes_committed_batches(self):
+        records = [
+            {"title": "Kept", "tags": ["Django"], "author": "writer"},
+            {"title": "Stopped", "author": "nobody"},
+        ]
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaisesMessage(CommandError, "Unknown authors: nobody"):
+                self.import_ndjson(records, "--batch-size=1")
+
+        self.assertTrue(Post.objects.filter(title="Kept").exists())
+        self.assertFalse(Post.objects.filter(title="Stopped").exists())
+        self.assertEqual(Tag.objects.get(name="Django").post_count, 1)
+        # Page cache and related-post refreshes are queued for the first batch
+        self.assertTrue(callbacks)
+
+    def test_heading_used_as_title(self):
+        record = parse_markdown("# A Title\n\nBody")
+        self.assertEqual(record, {"title": "A Title", "body": "Body"})
+
+    def test_unknown_author_fails(self):
+        with self.assertRaisesMessage(CommandError, "Unknown authors: nobody"):
+            self.import_ndjson([{"title": "X", "author": "nobody"}])
+
+
+@override_settings(ALLOWED_ADMIN_EMAIL="admin@example.com")
+class ExportContentTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pass"
+        )
+        tag = Tag.objects.create(name="Django")
+        for i in range(3):
+            post = Post.objects.create(
+                title=f"Post {i}", author=self.admin, body="Body", published=True
+            )
+            post.tags.add(tag)
+        Project.objects.create(title="Tool", description="Desc")
+        self.url = "/dashboard/export/"
+
+    def test_export_requires_admin(self):
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        other = User.objects.create_user(username="other", email="o@example.com")
+        self.client.force_login(other)
+        self.assertRedirects(self.client.get(self.url), "/")
+
+    def test_streams_ndjson_with_constant_queries(self):
+        """Test that the export reads in chunks instead of a query per row"""
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+            content = response.getvalue().decode()
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in content.splitlines()]
+        types = ["post"] * 3 + ["project"] * Project.objects.count()
+        self.assertEqual([r["type"] for r in records], types)
+        self.assertEqual(records[0]["tags"], ["Django"])
+
+        Post.objects.create(title="Post 3", author=self.admin, body="Body")
+        with CaptureQueriesContext(connection) as more_queries:
+            self.client.get(self.url).getvalue()
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_gzipped_csv(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(self.url, {"format": "csv", "gzip": "1"})
+        self.assertIn(".csv.gz", response["Content-Disposition"])
+        rows = list(
+            csv.DictReader(StringIO(gzip.decompress(response.getvalue()).decode()))
+        )
+        self.assertEqual(len(rows), 3 + Project.objects.count())
+        self.assertEqual(rows[0]["tags"], "Django")
+
+    def test_command_output_round_trips_through_import(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "export.ndjson"
+            call_command(
+                "export_content", "--type=posts", f"--output={path}", stderr=StringIO()
+            )
+            Post.objects.all().delete()
+            call_command("import_content", str(path), stdout=StringIO())
+        self.assertEqual(Post.objects.filter(tags__name="Django").count(), 3)
@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import PostDetailView, PostListView, TagListView
+from .views import PostDetailView, PostListView, PostSearchView, TagListView
 
 urlpatterns = [
     path("posts/", PostListView.as_view(), name="post-list"),
+    path("search/", PostSearchView.as_view(), name="post-search"),
     path("posts/<slug:slug>/", PostDetailView.as_view(), name="post-detail"),
     path("tags/", TagListView.as_view(), name="tag-list"),
 ]
@@ -1,27 +1,69 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 
+from apps.core.conditional import collection_etag, conditional_api, object_validators
+from apps.core.local_cache import get_tiered
+from apps.core.pagination import CreatedAtCursorPagination
+
+from .cache_keys import TAG_LIST_CACHE_KEY
+from .filters import PostFilter
 from .models import Post, Tag
-from .serializers import PostSerializer, TagSerializer
+from .search import FullTextSearchFilter, search_posts
+from .serializers import (
+    PostListSerializer,
+    PostSearchSerializer,
+    PostSerializer,
+    TagSerializer,
+)
+
+_published_posts_etag = collection_etag(Post.objects.published(), versions=["posts"])
+_post_etag, _post_last_modified = object_validators(
+    Post.objects.published(), "slug", versions=[lambda slug: f"post:{slug}", "tags"]
+)
 
 
+@conditional_api(etag_func=_published_posts_etag)
 class PostListView(generics.ListAPIView):
-    queryset = Post.objects.filter(published=True)
-    serializer_class = PostSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ["tags"]
+    queryset = Post.objects.published().for_listing()
+    serializer_class = PostListSerializer
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    filterset_class = PostFilter
     search_fields = ["title", "body"]
     ordering_fields = ["created_at", "updated_at"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]
 
 
+@conditional_api(etag_func=_post_etag, last_modified_func=_post_last_modified)
 class PostDetailView(generics.RetrieveAPIView):
-    queryset = Post.objects.filter(published=True)
+    queryset = Post.objects.published().with_related()
     serializer_class = PostSerializer
     lookup_field = "slug"
 
 
+@conditional_api(etag_func=_published_posts_etag)
+class PostSearchView(generics.ListAPIView):
+    """Ranked full-text search over published posts: ``?q=<terms>``"""
+
+    serializer_class = PostSearchSerializer
+
+    def get_queryset(self):
+        queryset = Post.objects.published().for_listing()
+        return search_posts(queryset, self.request.query_params.get("q", ""))
+
+
 class TagListView(generics.ListAPIView):
+    """All tags with their published-post counts. The serialized list is kept
+    in the two-tier cache and paginated from there."""
+
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
+
+    def list(self, request, *args, **kwargs):
+        tags = get_tiered(TAG_LIST_CACHE_KEY, self._serialize, ttl=3600)
+        return self.get_paginated_response(self.paginate_queryset(tags))
+
+    def _serialize(self):
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return [dict(tag) for tag in serializer.data]
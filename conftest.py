@@ -0,0 +1,37 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "benchmark suite (-m benchmark)")
+    group.addoption(
+        "--benchmark-sizes",
+        default="10000,100000",
+        help="Comma-separated numbers of posts to seed, one run per size",
+    )
+    group.addoption(
+        "--benchmark-iterations",
+        type=int,
+        default=50,
+        help="Measured requests per endpoint and size",
+    )
+    group.addoption(
+        "--benchmark-seed",
+        type=int,
+        default=1234,
+        help="Random seed for the generated dataset",
+    )
+    group.addoption(
+        "--benchmark-json",
+        default="benchmark-results.json",
+        help="Where to write the results",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks seed large datasets; only run them when asked for by marker
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -21,5 +21,17 @@ python manage.py migrate
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+if [ "$DJANGO_ENV" = "prod" ]; then
+  # Persistent connections are not reused across async requests; pool with
+  # PgBouncer instead (DB_POOLER=pgbouncer).
+  export DB_CONN_MAX_AGE="${DB_CONN_MAX_AGE:-0}"
+  if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+  fi
+  echo "Starting gunicorn (ASGI)..."
+  exec gunicorn mysite.asgi:application -c gunicorn.conf.py
+fi
+
 echo "Starting server..."
 python manage.py runserver 0.0.0.0:8000
@@ -0,0 +1,41 @@
+"""Most queries each public endpoint may run for an anonymous GET.
+
+Budgets are constants: listings must not run a query per row, so the count
+has to be the same for every page size and data volume. The registry covers
+every named route in mysite.urls, blog.urls and portfolio.urls;
+mysite/test_query_budgets.py checks that and runs each endpoint at two data
+sizes. At runtime RequestTimingMiddleware logs requests that go over
+(``REQUEST_QUERY_BUDGET`` applies to views not listed here).
+
+Counts are for a cold cache with the page cache off. Keep them tight: raise
+one only together with the change that needs the extra query.
+"""
+
+QUERY_BUDGETS = {
+    # Site pages
+    "home": 5,
+    "about": 0,
+    "projects": 2,
+    "project_detail": 2,
+    "blog_index": 3,
+    "blog_search": 4,
+    "blog_detail": 4,
+    # One tag prefetch per FEED_CHUNK_SIZE items, capped by FEED_ITEMS
+    "blog_feed": 4,
+    "blog_tag_feed": 5,
+    "contact": 0,
+    # Crawlers
+    "robots_txt": 0,
+    "sitemap": 3,
+    "sitemap_gz": 3,
+    "sitemap_section": 1,
+    "sitemap_section_gz": 1,
+    # Blog API
+    "post-list": 3,
+    "post-search": 4,
+    "post-detail": 3,
+    "tag-list": 1,
+    # Portfolio API
+    "project-list": 2,
+    "project-detail": 2,
+}
@@ -34,6 +34,7 @@ DJANGO_APPS = [
 ]
 
 THIRD_PARTY_APPS = [
+    "django_prometheus",
     "rest_framework",
     "corsheaders",
     "django_celery_beat",
@@ -54,8 +55,10 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "django_prometheus.middleware.PrometheusBeforeMiddleware",
+    "apps.core.instrumentation.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.core.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,13 +67,29 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "apps.core.db_router.ReplicaRoutingMiddleware",
+    "django_prometheus.middleware.PrometheusAfterMiddleware",
 ]
 
+# Server-Timing header with per-request DB, cache and template timings
+# (apps.core.instrumentation). Requests running more queries than their
+# view's budget in QUERY_BUDGETS, or REQUEST_QUERY_BUDGET for views without
+# one, are logged and counted in mysite_view_query_budget_exceeded_total
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "True").lower() in [
+    "true",
+    "1",
+    "yes",
+    "on",
+]
+REQUEST_QUERY_BUDGET = int(os.environ.get("REQUEST_QUERY_BUDGET", "30"))
+QUERY_BUDGETS = "mysite.query_budgets.QUERY_BUDGETS"
+
 ROOT_URLCONF = "mysite.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Django's template backend, timing renders
+        "BACKEND": "apps.core.template_backends.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -80,6 +99,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "admin_dashboard.context_processors.admin_settings",
+                "apps.core.context_processors.front_end_assets",
             ],
         },
     },
@@ -88,27 +108,98 @@ TEMPLATES = [
 WSGI_APPLICATION = "mysite.wsgi.application"
 
 # Database configuration
+# Behind a transaction-pooling PgBouncer (DB_POOLER=pgbouncer) a session
+# can move between server connections, so server-side cursors are disabled.
+DB_POOLER = os.environ.get("DB_POOLER", "")
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # PostgreSQL backend with connection metrics (apps.core.db)
+        "ENGINE": "apps.core.db.postgresql",
         "NAME": os.environ.get("DB_NAME", "mysite"),
         "USER": os.environ.get("DB_USER", "postgres"),
         "PASSWORD": os.environ.get("DB_PASS", "postgres"),
         "HOST": os.environ.get("DB_HOST", "localhost"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        # Reuse each thread's connection across requests, checking it is
+        # still alive before the first query of a request
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": DB_POOLER == "pgbouncer",
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", "5")),
+        },
     }
 }
 
+# Optional read replicas ("host" or "host:port", comma-separated), used by
+# views marked safe for replica reads (apps.core.db_router)
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    replica_host, _, replica_port = replica.strip().partition(":")
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{number}")
+
+DATABASE_ROUTERS = ["apps.core.db_router.ReplicaRouter"]
+# Replicas further behind than this are skipped until they catch up
+REPLICA_MAX_LAG = float(os.environ.get("REPLICA_MAX_LAG", "10"))
+REPLICA_CHECK_INTERVAL = float(os.environ.get("REPLICA_CHECK_INTERVAL", "5"))
+# After a write, the client reads from the primary for this long
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "15"))
+
 # Cache configuration (Redis)
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", "50"))
+
+# Cached values above this size are zlib-compressed (apps.core.cache_serializers)
+CACHE_COMPRESS_MIN_BYTES = int(os.environ.get("CACHE_COMPRESS_MIN_BYTES", "1024"))
+CACHE_COMPRESS_LEVEL = int(os.environ.get("CACHE_COMPRESS_LEVEL", "6"))
+
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        # Django's RedisCache, counting hits and misses
+        "BACKEND": "apps.core.cache_backends.RedisCache",
         "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "serializer": "apps.core.cache_serializers.CompressedSerializer",
+            # One pool per process shared with apps.core.redis_pool clients
+            "pool_class": "apps.core.redis_pool.SharedConnectionPool",
+            "max_connections": REDIS_MAX_CONNECTIONS,
+        },
     }
 }
 
+# In-process cache tier for tiny, very hot values (apps.core.local_cache).
+# Entries are evicted across processes via Redis pub/sub.
+LOCAL_CACHE = {
+    "MAX_ENTRIES": int(os.environ.get("LOCAL_CACHE_MAX_ENTRIES", "1000")),
+    "TTL": int(os.environ.get("LOCAL_CACHE_TTL", "5")),
+    "CHANNEL": "mysite:local-cache-invalidate",
+    "PUBSUB": True,
+}
+
+# Whole-page cache for the public site, invalidated by model signals
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "True").lower() in [
+    "true",
+    "1",
+    "yes",
+    "on",
+]
+PAGE_CACHE_TIMEOUT = int(os.environ.get("PAGE_CACHE_TIMEOUT", "3600"))
+
+# Readiness probe (status.checks): per-dependency timeout and how long a
+# result is reused to absorb bursts of probes
+HEALTH_CHECK_TIMEOUT = float(os.environ.get("HEALTH_CHECK_TIMEOUT", "1.0"))
+HEALTH_CHECK_CACHE_SECONDS = float(os.environ.get("HEALTH_CHECK_CACHE_SECONDS", "2"))
+
 # Celery Configuration
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
@@ -116,6 +207,8 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
+CELERY_REDIS_MAX_CONNECTIONS = REDIS_MAX_CONNECTIONS
+CELERY_BROKER_POOL_LIMIT = 10
 
 # Celery Beat Schedule
 CELERY_BEAT_SCHEDULE = {
@@ -123,6 +216,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.core.tasks.backup_db",
         "schedule": crontab(hour=2, minute=30),
     },
+    "rebuild-related-posts-nightly": {
+        "task": "blog.tasks.rebuild_related_posts",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "refresh-tag-post-counts-hourly": {
+        "task": "blog.tasks.refresh_tag_post_counts",
+        "schedule": crontab(minute=15),
+    },
 }
 
 # Password validation
@@ -151,6 +252,14 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
+# Collected files get a content hash in their name (and gzip/brotli copies),
+# which WhiteNoise serves with a far-future immutable Cache-Control
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -12,10 +12,34 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 if "test" in sys.argv or "pytest" in sys.modules:
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.sqlite3",
+            "ENGINE": "apps.core.db.sqlite3",
             "NAME": ":memory:",
+        },
+        # Mirrors default; tests that exercise routing enable it through
+        # DATABASE_REPLICAS
+        "replica": {
+            "ENGINE": "apps.core.db.sqlite3",
+            "NAME": ":memory:",
+            "TEST": {"MIRROR": "default"},
+        },
+    }
+    DATABASE_REPLICAS = []
+    CACHES = {
+        "default": {
+            "BACKEND": "apps.core.cache_backends.LocMemCache",
         }
     }
+    # Tests that exercise the page cache enable it explicitly
+    PAGE_CACHE_ENABLED = False
+    LOCAL_CACHE["PUBSUB"] = False
+    CELERY_BROKER_URL = "memory://"
+    # Tests don't run collectstatic, so there is no manifest of hashed names
+    STORAGES = {
+        **STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
 
 LOGGING["formatters"]["simple"] = {
     "format": "{levelname} {name} {message}",
@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import logging
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.http import Http404
+from django.urls import reverse
+
+from apps.core.cache import get_or_compute
+from apps.core.page_cache import get_versions
+from blog.models import Post, Tag
+from portfolio.models import Project
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# URLs per sitemap page; the protocol allows 50,000, smaller pages keep
+# each response and each cache entry modest.
+SITEMAP_PAGE_SIZE = 5000
+SITEMAP_CHUNK_SIZE = 2000
+# Versions change on every edit, so this only bounds how long unused
+# entries linger.
+SITEMAP_TTL = 60 * 60 * 24
+
+
+def _post_urls():
+    rows = Post.objects.published().order_by("pk").values_list("slug", "updated_at")
+    for slug, updated_at in rows.iterator(chunk_size=SITEMAP_CHUNK_SIZE):
+        yield reverse("blog_detail", args=[slug]), updated_at
+
+
+def _tag_urls():
+    # Tags have no page of their own, only their feed
+    rows = (
+        Tag.objects.filter(post_count__gt=0)
+        .annotate(lastmod=Max("post__updated_at", filter=Q(post__published=True)))
+        .order_by("pk")
+        .values_list("slug", "lastmod")
+    )
+    for slug, lastmod in rows.iterator(chunk_size=SITEMAP_CHUNK_SIZE):
+        yield reverse("blog_tag_feed", args=[slug, "atom"]), lastmod
+
+
+def _project_urls():
+    rows = Project.objects.order_by("pk").values_list("slug", "updated_at")
+    for slug, updated_at in rows.iterator(chunk_size=SITEMAP_CHUNK_SIZE):
+        yield reverse("project_detail", args=[slug]), updated_at
+
+
+# Section name -> (page-cache dependencies, URL generator)
+SECTIONS = {
+    "posts": (["posts"], _post_urls),
+    "tags": (["posts", "tags"], _tag_urls),
+    "projects": (["projects"], _project_urls),
+}
+
+
+def _pages(entries):
+    entries = iter(entries)
+    while page := list(islice(entries, SITEMAP_PAGE_SIZE)):
+        yield page
+
+
+def _lastmod(value):
+    return f"<lastmod>{value.isoformat(timespec='seconds')}</lastmod>" if value else ""
+
+
+def _render(root, element, base_url, entries):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<{root} xmlns="{SITEMAP_NS}">']
+    for path, lastmod in entries:
+        lines.append(
+            f"<{element}><loc>{escape(base_url + path)}</loc>"
+            f"{_lastmod(lastmod)}</{element}>"
+        )
+    lines.append(f"</{root}>")
+    return gzip.compress("\n".join(lines).encode())
+
+
+def _store(key, content):
+    try:
+        cache.set(key, content, SITEMAP_TTL)
+    except Exception as e:
+        logger.warning(f"Sitemap cache store for {key} failed: {e}")
+
+
+def _section_key(name, base_url):
+    dependencies, _ = SECTIONS[name]
+    variant = "|".join([base_url, name, *map(str, get_versions(dependencies))])
+    return f"sitemap:{name}:{hashlib.md5(variant.encode()).hexdigest()}"
+
+
+def _build_section(name, key, base_url):
+    """Render every page of a section in one pass over the rows and cache
+    them gzipped. Returns the lastmod of each page for the index."""
+    _, urls = SECTIONS[name]
+    lastmods = []
+    for number, page in enumerate(_pages(urls()), start=1):
+        _store(f"{key}:{number}", _render("urlset", "url", base_url, page))
+        lastmods.append(max((lastmod for _, lastmod in page if lastmod), default=None))
+    return lastmods
+
+
+def _section(name, base_url):
+    key = _section_key(name, base_url)
+    lastmods = get_or_compute(
+        key,
+        lambda: _build_section(name, key, base_url),
+        SITEMAP_TTL,
+        name="sitemap",
+    )
+    return key, lastmods
+
+
+def sitemap_index(base_url, compressed=False):
+    """Return the gzipped sitemap index and its ETag.
+
+    Section pages are only rebuilt after the content behind them changed;
+    the compressed index points crawlers at the compressed pages.
+    """
+    suffix = ".gz" if compressed else ""
+    keys, entries = [], []
+    for name in SECTIONS:
+        key, lastmods = _section(name, base_url)
+        keys.append(key)
+        for number, lastmod in enumerate(lastmods, start=1):
+            path = reverse("sitemap_section", args=[name, number]) + suffix
+            entries.append((path, lastmod))
+    etag = hashlib.md5("|".join([*keys, suffix]).encode()).hexdigest()
+    return _render("sitemapindex", "sitemap", base_url, entries), etag
+
+
+def sitemap_page(base_url, name, number):
+    """Return one gzipped sitemap page and its ETag."""
+    if name not in SECTIONS:
+        raise Http404("Unknown sitemap section")
+    key, lastmods = _section(name, base_url)
+    if not 1 <= number <= len(lastmods):
+        raise Http404("Sitemap page out of range")
+
+    page_key = f"{key}:{number}"
+    try:
+        content = cache.get(page_key)
+    except Exception as e:
+        logger.warning(f"Sitemap cache read for {page_key} failed: {e}")
+        content = None
+    if content is None:
+        # Evicted on its own: render just this page from the rows it covers
+        _, urls = SECTIONS[name]
+        start = (number - 1) * SITEMAP_PAGE_SIZE
+        page = islice(urls(), start, start + SITEMAP_PAGE_SIZE)
+        content = _render("urlset", "url", base_url, page)
+        _store(page_key, content)
+    return content, hashlib.md5(page_key.encode()).hexdigest()
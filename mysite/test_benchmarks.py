@@ -0,0 +1,173 @@
+"""Benchmarks of the hot endpoints against large seeded datasets.
+
+Opt-in: ``pytest -m benchmark`` (see conftest.py for the options). Each
+dataset size is seeded once with the seed_data generator (apps.core.seeding),
+deterministically, inside a transaction that is rolled back afterwards.
+Every endpoint is requested sequentially through the test client with the
+page cache off, so the numbers are the cost of the Django stack (views, ORM,
+templates) without network or proxy overhead.
+Results go to a JSON file so runs can be compared over time.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+import pytest
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.seeding import DataSeeder
+from blog.models import Post, Tag
+from blog.tasks import update_related
+
+# django_db makes pytest-django create the test database; each test runs in
+# a savepoint inside the dataset's transaction
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+WARMUP_REQUESTS = 5
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@pytest.fixture(scope="session")
+def benchmark_report(request):
+    results = []
+    yield results
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "iterations": request.config.getoption("benchmark_iterations"),
+        "seed": request.config.getoption("benchmark_seed"),
+        "results": results,
+    }
+    path = Path(request.config.getoption("benchmark_json"))
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("benchmark_sizes").split(",")
+        metafunc.parametrize(
+            "dataset_size",
+            [int(size) for size in sizes],
+            ids=lambda size: f"{size}-posts",
+            scope="module",
+        )
+
+
+@pytest.fixture(scope="module")
+def dataset(request, dataset_size, django_db_setup, django_db_blocker):
+    size = dataset_size
+    with django_db_blocker.unblock(), transaction.atomic():
+        started = time.perf_counter()
+        DataSeeder(
+            posts=size,
+            tags=50,
+            projects=max(size // 100, 1),
+            seed=request.config.getoption("benchmark_seed"),
+        ).run()
+        seeded_in = time.perf_counter() - started
+
+        published = Post.objects.published().order_by("-created_at", "-id")
+        middle = published.only("pk", "slug")[size // 3]
+        update_related(middle.pk)
+        yield {
+            "size": size,
+            "seeded_in": seeded_in,
+            "post_slug": middle.slug,
+            "tag_slug": Tag.objects.order_by("-post_count").values_list(
+                "slug", flat=True
+            )[0],
+        }
+        transaction.set_rollback(True)
+
+
+def _endpoints(data):
+    return {
+        "home": (reverse("home"), {}),
+        "blog_index": (reverse("blog_index"), {}),
+        "blog_index_htmx": (reverse("blog_index"), {"HX-Request": "true"}),
+        "blog_detail": (reverse("blog_detail", args=[data["post_slug"]]), {}),
+        "post_list_api": (
+            reverse("post-list")
+            + f"?search=django&tags={data['tag_slug']}&ordering=-updated_at",
+            {},
+        ),
+        "project_list_api": (reverse("project-list"), {}),
+        "healthz": (reverse("healthz"), {}),
+    }
+
+
+def measure(client, url, headers, iterations):
+    for _ in range(WARMUP_REQUESTS):
+        client.get(url, headers=headers)
+
+    latencies, queries = [], []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            request_started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - request_started)
+        assert response.status_code == 200, f"{url}: {response.status_code}"
+        queries.append(len(captured))
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "throughput_rps": round(iterations / elapsed, 1),
+        "latency_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 3),
+            "p99": round(percentiles[98] * 1000, 3),
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+        "queries": {"median": statistics.median(queries), "max": max(queries)},
+    }
+
+
+ENDPOINTS = [
+    "home",
+    "blog_index",
+    "blog_index_htmx",
+    "blog_detail",
+    "post_list_api",
+    "project_list_api",
+    "healthz",
+]
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+@override_settings(PAGE_CACHE_ENABLED=False, HEALTH_CHECK_CACHE_SECONDS=0)
+def test_endpoint(endpoint, dataset, benchmark_report, request):
+    url, headers = _endpoints(dataset)[endpoint]
+    iterations = request.config.getoption("benchmark_iterations")
+    result = measure(Client(), url, headers, iterations)
+    benchmark_report.append(
+        {
+            "endpoint": endpoint,
+            "url": url,
+            "posts": dataset["size"],
+            "seeded_in_s": round(dataset["seeded_in"], 1),
+            "iterations": iterations,
+            **result,
+        }
+    )
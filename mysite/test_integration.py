@@ -53,27 +53,48 @@ class HTMXIntegrationTests(TestCase):
         # Should contain pagination button if there are more posts
         self.assertContains(response, "Load More Posts")
 
+    def follow_next(self, response):
+        """Fetch the page behind the "Load More Posts" button's cursor"""
+        import re
+
+        next_url = re.search(r'hx-get="([^"]+)"', response.content.decode()).group(1)
+        self.assertIn("?cursor=", next_url)
+        return self.client.get(next_url, HTTP_HX_REQUEST="true")
+
+    def titles(self, response):
+        import re
+
+        return re.findall(r"Test Post \d+", response.content.decode())
+
     @pytest.mark.htmx
     def test_htmx_blog_pagination_second_page(self):
         """Test HTMX request for second page of blog posts"""
         headers = {"HTTP_HX_REQUEST": "true"}
-        response = self.client.get(reverse("blog_index") + "?page=2", **headers)
+        first = self.client.get(reverse("blog_index"), **headers)
+        response = self.follow_next(first)
 
         self.assertEqual(response.status_code, 200)
         # Should be partial template
         self.assertNotContains(response, "<html>")
-        # Should contain different posts than first page
-        self.assertContains(response, "Test Post")
+        # Newest first, ten per page: the next ten posts, none from page one
+        self.assertEqual(
+            self.titles(response), [f"Test Post {i:02d}" for i in range(14, 4, -1)]
+        )
+        self.assertContains(response, "Load More Posts")
 
     @pytest.mark.htmx
     def test_htmx_blog_pagination_last_page(self):
         """Test HTMX request for last page (no more pagination)"""
         headers = {"HTTP_HX_REQUEST": "true"}
-        response = self.client.get(reverse("blog_index") + "?page=3", **headers)
+        first = self.client.get(reverse("blog_index"), **headers)
+        response = self.follow_next(self.follow_next(first))
 
         self.assertEqual(response.status_code, 200)
-        # On last page, should not have "Load More Posts" button
-        # The template logic should determine if pagination button appears
+        self.assertEqual(
+            self.titles(response), [f"Test Post {i:02d}" for i in range(4, -1, -1)]
+        )
+        # On last page, there is no "Load More Posts" button
+        self.assertNotContains(response, "Load More Posts")
 
     @pytest.mark.htmx
     def test_htmx_request_headers_detection(self):
@@ -126,14 +147,14 @@ class TemplateIntegrationTests(TestCase):
 
     def test_template_static_file_loading(self):
         """Test that templates properly reference static files"""
-        response = self.client.get(reverse("home"))
+        with patch("apps.core.context_processors.is_built", return_value=True):
+            response = self.client.get(reverse("home"))
 
         # Check CSS references
-        self.assertContains(response, "/static/site.css")
+        self.assertContains(response, "/static/dist/site.css")
 
-        # Check external library references
-        self.assertContains(response, "htmx.org")
-        self.assertContains(response, "tailwindcss.com")
+        # Check self-hosted library references
+        self.assertContains(response, "/static/dist/htmx.min.js")
 
     def test_template_url_reversing(self):
         """Test that URL reversing works in templates"""
@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver, reverse
+
+from apps.core.local_cache import local_cache
+from apps.core.seeding import DataSeeder
+from blog.models import Post, Tag
+from blog.tasks import update_related
+from portfolio.models import Project
+
+from .query_budgets import QUERY_BUDGETS
+
+# Route name -> URL to request, built from the seeded data
+ENDPOINTS = {
+    "home": lambda d: reverse("home"),
+    "about": lambda d: reverse("about"),
+    "projects": lambda d: reverse("projects"),
+    "project_detail": lambda d: reverse("project_detail", args=[d["project"].slug]),
+    "blog_index": lambda d: reverse("blog_index"),
+    "blog_search": lambda d: reverse("blog_search") + "?q=the",
+    "blog_detail": lambda d: reverse("blog_detail", args=[d["post"].slug]),
+    "blog_feed": lambda d: reverse("blog_feed", args=["atom"]),
+    "blog_tag_feed": lambda d: reverse("blog_tag_feed", args=[d["tag"].slug, "rss"]),
+    "contact": lambda d: reverse("contact"),
+    "robots_txt": lambda d: reverse("robots_txt"),
+    "sitemap": lambda d: reverse("sitemap"),
+    "sitemap_gz": lambda d: reverse("sitemap_gz"),
+    "sitemap_section": lambda d: reverse("sitemap_section", args=["posts", 1]),
+    "sitemap_section_gz": lambda d: reverse("sitemap_section_gz", args=["tags", 1]),
+    "post-list": lambda d: reverse("post-list") + f"?tags={d['tag'].slug}",
+    "post-search": lambda d: reverse("post-search") + "?q=the",
+    "post-detail": lambda d: reverse("post-detail", args=[d["post"].slug]),
+    "tag-list": lambda d: reverse("tag-list"),
+    "project-list": lambda d: reverse("project-list"),
+    "project-detail": lambda d: reverse("project-detail", args=[d["project"].pk]),
+}
+
+URLCONFS = ["mysite.urls", "blog.urls", "portfolio.urls"]
+
+
+def route_names(urlconf):
+    """Names of the routes ``urlconf`` defines, not counting its includes"""
+    return {
+        pattern.name
+        for pattern in get_resolver(urlconf).url_patterns
+        if isinstance(pattern, URLPattern) and pattern.name
+    }
+
+
+class QueryBudgetRegistryTest(TestCase):
+    def test_every_route_has_a_budget(self):
+        routes = set().union(*(route_names(urlconf) for urlconf in URLCONFS))
+        self.assertEqual(routes - set(QUERY_BUDGETS), set(), "routes without budget")
+        self.assertEqual(set(QUERY_BUDGETS) - routes, set(), "budgets without route")
+        self.assertEqual(set(ENDPOINTS), set(QUERY_BUDGETS))
+
+
+class QueryBudgetTest(TestCase):
+    """Every endpoint stays within its budget and runs the same number of
+    queries at both sizes. Both are past every page and feed limit (the feed
+    prefetches tags per chunk), so a difference can only come from a query
+    per row."""
+
+    SIZES = (80, 240)
+
+    def seed(self, posts):
+        DataSeeder(posts=posts, tags=6, projects=posts // 2, users=2, seed=1).run()
+        post = Post.objects.published().order_by("-created_at").first()
+        update_related(post.pk)
+        return {
+            "post": post,
+            "tag": Tag.objects.order_by("-post_count").first(),
+            "project": Project.objects.order_by("-created_at").first(),
+        }
+
+    def count_queries(self, data):
+        counts = {}
+        for name, url in ENDPOINTS.items():
+            cache.clear()
+            local_cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url(data))
+            self.assertEqual(response.status_code, 200, name)
+            if hasattr(response, "streaming_content"):
+                # Feeds query while streaming
+                with CaptureQueriesContext(connection) as streamed:
+                    b"".join(response.streaming_content)
+                counts[name] = len(queries) + len(streamed)
+            else:
+                counts[name] = len(queries)
+        return counts
+
+    def test_budgets_hold_at_two_sizes(self):
+        small = self.count_queries(self.seed(self.SIZES[0]))
+        large = self.count_queries(self.seed(self.SIZES[1] - self.SIZES[0]))
+
+        for name, budget in QUERY_BUDGETS.items():
+            with self.subTest(endpoint=name):
+                self.assertLessEqual(large[name], budget, "over budget")
+                self.assertEqual(
+                    small[name], large[name], "query count grows with the data"
+                )
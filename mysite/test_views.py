@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock, patch
 
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 
@@ -85,6 +85,74 @@ class FrontendViewTests(TestCase):
         self.assertContains(response, self.post.body)
         self.assertContains(response, self.tag.name)
 
+    def test_blog_search_page(self):
+        """Test that blog search page lists matching posts"""
+        response = self.client.get(reverse("blog_search"), {"q": "test post"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Search the Blog")
+        self.assertContains(response, self.post.title)
+
+        response = self.client.get(reverse("blog_search"), {"q": "nomatch"})
+        self.assertContains(response, "No posts matched")
+
+    def test_blog_index_conditional_get(self):
+        """Test that unchanged listings return 304 and changes invalidate"""
+        response = self.client.get(reverse("blog_index"))
+        etag = response["ETag"]
+
+        response = self.client.get(reverse("blog_index"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # The HTMX partial is a different representation
+        response = self.client.get(
+            reverse("blog_index"), HTTP_IF_NONE_MATCH=etag, HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.post.title = "Updated Title"
+        self.post.save()
+        response = self.client.get(reverse("blog_index"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Updated Title")
+
+    @patch("blog.signals.refresh_related_posts.delay")
+    def test_tag_changes_invalidate_etags(self, refresh_related):
+        """Test that adding or renaming a tag changes the pages showing it"""
+        from blog.models import Tag
+
+        urls = [
+            reverse("blog_index"),
+            reverse("blog_detail", kwargs={"slug": self.post.slug}),
+        ]
+        etags = [self.client.get(url)["ETag"] for url in urls]
+
+        new_tag = Tag.objects.create(name="Freshly Added", slug="freshly-added")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.tags.add(new_tag)
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Freshly Added")
+
+        etag = self.client.get(urls[1])["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            new_tag.name = "Renamed Tag"
+            new_tag.save()
+        response = self.client.get(urls[1], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Renamed Tag")
+
+    def test_blog_detail_conditional_get(self):
+        """Test that blog detail honours If-Modified-Since"""
+        url = reverse("blog_detail", kwargs={"slug": self.post.slug})
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
     def test_blog_detail_404_for_invalid_slug(self):
         """Test that blog detail returns 404 for invalid slug"""
         response = self.client.get(
@@ -215,12 +283,404 @@ class HTMXViewTests(TestCase):
         self.assertContains(response, "Test Post")  # Contains posts
 
     def test_blog_pagination_htmx(self):
-        """Test HTMX pagination request"""
+        """Test HTMX pagination request following the next cursor"""
+        import re
+
         headers = {"HTTP_HX_REQUEST": "true"}
-        response = self.client.get(reverse("blog_index") + "?page=2", **headers)
+        first = self.client.get(reverse("blog_index"), **headers)
+        next_url = re.search(r'hx-get="([^"]+)"', first.content.decode()).group(1)
+        self.assertIn("?cursor=", next_url)
+
+        response = self.client.get(next_url, **headers)
         self.assertEqual(response.status_code, 200)
         self.assertNotContains(response, "<html>")  # Partial template
-        # Should contain posts from page 2
+        # Newest first, ten per page: the second page holds the five oldest
+        titles = re.findall(r"Test Post \d+", response.content.decode())
+        self.assertEqual(titles, [f"Test Post {i}" for i in range(4, -1, -1)])
+        self.assertNotContains(response, "Load More Posts")
+
+    def test_blog_cursor_pagination_walks_all_posts(self):
+        """Test that following cursors visits every post exactly once"""
+        import re
+
+        headers = {"HTTP_HX_REQUEST": "true"}
+        url = reverse("blog_index")
+        seen = []
+        while url:
+            response = self.client.get(url, **headers)
+            content = response.content.decode()
+            seen += re.findall(r"Test Post \d+", content)
+            match = re.search(r'hx-get="([^"]+)"', content)
+            url = match.group(1) if match else None
+        self.assertEqual(len(seen), 15)
+        self.assertEqual(len(set(seen)), 15)
+
+    def test_blog_invalid_cursor_returns_404(self):
+        """Test that a malformed cursor is rejected"""
+        response = self.client.get(reverse("blog_index") + "?cursor=!!!")
+        self.assertEqual(response.status_code, 404)
+
+    def test_blog_index_query_count_independent_of_tags(self):
+        """Test that rendering tags does not issue a query per post"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from blog.models import Post, Tag
+
+        headers = {"HTTP_HX_REQUEST": "true"}
+        with CaptureQueriesContext(connection) as untagged:
+            self.client.get(reverse("blog_index"), **headers)
+
+        tags = [Tag.objects.create(name=f"Tag {i}") for i in range(3)]
+        for post in Post.objects.all():
+            post.tags.add(*tags)
+
+        with CaptureQueriesContext(connection) as tagged:
+            response = self.client.get(reverse("blog_index"), **headers)
+        self.assertContains(response, "Tag 0")
+        self.assertEqual(len(tagged), len(untagged))
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.cache import cache
+
+        from blog.models import Post, Tag
+
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.tag = Tag.objects.create(name="Django")
+        self.post = Post.objects.create(
+            title="Cached Post",
+            slug="cached-post",
+            author=self.user,
+            body="Cached content",
+            published=True,
+        )
+
+    def test_anonymous_pages_served_from_cache_without_queries(self):
+        """Test that a repeated anonymous request does not touch the DB"""
+        url = reverse("blog_detail", kwargs={"slug": self.post.slug})
+        response = self.client.get(url)
+        self.assertEqual(response["X-Page-Cache"], "miss")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response["X-Page-Cache"], "hit")
+        self.assertContains(response, "Cached Post")
+
+    def test_htmx_variant_cached_separately(self):
+        """Test that the HTMX partial and full page have separate entries"""
+        self.client.get(reverse("blog_index"))
+        response = self.client.get(reverse("blog_index"), HTTP_HX_REQUEST="true")
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertNotContains(response, "<!DOCTYPE html>")
+
+    def test_post_save_invalidates_pages(self):
+        """Test that editing a post rebuilds the pages that show it"""
+        detail_url = reverse("blog_detail", kwargs={"slug": self.post.slug})
+        self.client.get(reverse("blog_index"))
+        self.client.get(detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = "Edited Post"
+            self.post.save()
+
+        self.assertContains(self.client.get(reverse("blog_index")), "Edited Post")
+        self.assertContains(self.client.get(detail_url), "Edited Post")
+
+    def test_invalidation_waits_for_commit(self):
+        """Test that pages are not invalidated before the edit is visible"""
+        from apps.core.page_cache import get_versions
+
+        before = get_versions(["posts", f"post:{self.post.slug}"])
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.title = "Edited Post"
+            self.post.save()
+        self.assertEqual(get_versions(["posts", f"post:{self.post.slug}"]), before)
+
+        for callback in callbacks:
+            callback()
+        after = get_versions(["posts", f"post:{self.post.slug}"])
+        self.assertTrue(all(new > old for new, old in zip(after, before)))
+
+    @patch("blog.signals.refresh_related_posts.delay")
+    def test_tag_changes_invalidate_pages(self, refresh_related):
+        """Test that adding or renaming tags rebuilds post pages"""
+        detail_url = reverse("blog_detail", kwargs={"slug": self.post.slug})
+        self.client.get(detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.tags.add(self.tag)
+        self.assertContains(self.client.get(detail_url), "Django")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.name = "Flask"
+            self.tag.save()
+        self.assertContains(self.client.get(detail_url), "Flask")
+
+    def test_unrelated_project_does_not_invalidate_post(self):
+        """Test that invalidation only touches dependent pages"""
+        from portfolio.models import Project
+
+        url = reverse("blog_detail", kwargs={"slug": self.post.slug})
+        self.client.get(url)
+        Project.objects.create(title="New Project", description="Desc")
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "hit")
+
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "New Project")
+
+    def test_authenticated_requests_bypass_cache(self):
+        """Test that logged-in users always get a fresh page"""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("home"))
+        self.assertNotIn("X-Page-Cache", response)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class AsyncViewTests(TestCase):
+    """The public views are async; drive them through the ASGI handler"""
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.cache import cache
+
+        from blog.models import Post
+        from portfolio.models import Project
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Async Post",
+            slug="async-post",
+            author=self.user,
+            body="Async content",
+            published=True,
+        )
+        self.project = Project.objects.create(title="Async Project", description="Desc")
+
+    async def test_public_pages_render(self):
+        """Test that the async views render their pages"""
+        pages = {
+            reverse("home"): "Async Post",
+            reverse("projects"): "Async Project",
+            reverse("project_detail", args=[self.project.slug]): "Async Project",
+            reverse("blog_index"): "Async Post",
+            reverse("blog_detail", args=[self.post.slug]): "Async content",
+            reverse("blog_search") + "?q=async": "Async Post",
+            reverse("about"): "About",
+        }
+        for url, text in pages.items():
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertContains(response, text)
+
+    async def test_feed_streams_under_asgi(self):
+        """Test that feeds stream item by item instead of being buffered"""
+        response = await self.async_client.get(reverse("blog_feed", args=["atom"]))
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertIn(b"Async Post", b"".join(chunks))
+
+    async def test_conditional_get_and_page_cache(self):
+        """Test that ETags and the page cache work for async views"""
+        url = reverse("blog_detail", args=[self.post.slug])
+        response = await self.async_client.get(url)
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        response = await self.async_client.get(url)
+        self.assertEqual(response["X-Page-Cache"], "hit")
+
+        response = await self.async_client.get(
+            url, headers={"If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_missing_object_is_404(self):
+        """Test that aget_object_or_404 raises a 404"""
+        response = await self.async_client.get(reverse("blog_detail", args=["nope"]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_authenticated_requests_bypass_cache(self):
+        """Test that the async cache wrapper resolves the user asynchronously"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Page-Cache", response)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class FeedTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.cache import cache
+
+        from blog.models import Post, Tag
+
+        cache.clear()
+        self.client = Client()
+        user = User.objects.create_user(username="author", password="testpass123")
+        self.tag = Tag.objects.create(name="Django")
+        self.post = Post.objects.create(
+            title="Feed Post",
+            slug="feed-post",
+            author=user,
+            body="Feed content",
+            published=True,
+        )
+        self.post.tags.add(self.tag)
+        Post.objects.create(
+            title="Draft Post", slug="draft-post", author=user, body="Draft"
+        )
+
+    def test_atom_and_rss_feeds(self):
+        """Test that both formats list published posts only"""
+        for fmt, content_type in [
+            ("atom", "application/atom+xml"),
+            ("rss", "application/rss+xml"),
+        ]:
+            response = self.client.get(reverse("blog_feed", args=[fmt]))
+            self.assertTrue(response.streaming)
+            self.assertTrue(response["Content-Type"].startswith(content_type))
+            content = response.getvalue().decode()
+            self.assertIn("Feed Post", content)
+            self.assertIn("http://testserver/blog/feed-post/", content)
+            self.assertNotIn("Draft Post", content)
+
+    def test_tag_feed(self):
+        """Test that tag feeds only include posts with the tag"""
+        url = reverse("blog_tag_feed", args=[self.tag.slug, "atom"])
+        self.assertContains(self.client.get(url), "Feed Post")
+
+        other = self.tag.__class__.objects.create(name="Flask")
+        url = reverse("blog_tag_feed", args=[other.slug, "atom"])
+        self.assertNotContains(self.client.get(url), "Feed Post")
+
+    def test_unknown_format_and_tag_404(self):
+        self.assertEqual(self.client.get("/blog/feed/json/").status_code, 404)
+        url = reverse("blog_tag_feed", args=["missing", "rss"])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_repeat_polls_skip_database(self):
+        """Test that feeds are served from cache and answer 304 by ETag"""
+        url = reverse("blog_feed", args=["atom"])
+        first = self.client.get(url)
+        content = first.getvalue()
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached.content, content)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_publishing_invalidates_feed(self):
+        """Test that a newly published post changes the feed and its ETag"""
+        url = reverse("blog_feed", args=["rss"])
+        response = self.client.get(url)
+        response.getvalue()
+        etag = response["ETag"]
+
+        draft = self.post.__class__.objects.get(slug="draft-post")
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.published = True
+            draft.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "Draft Post")
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.cache import cache
+
+        from blog.models import Post, Tag
+        from portfolio.models import Project
+
+        cache.clear()
+        self.client = Client()
+        user = User.objects.create_user(username="author", password="testpass123")
+        tag = Tag.objects.create(name="Django")
+        self.post = Post.objects.create(
+            title="Mapped Post",
+            slug="mapped-post",
+            author=user,
+            body="Content",
+            published=True,
+        )
+        self.post.tags.add(tag)
+        Post.objects.create(title="Draft", slug="draft", author=user, body="Draft")
+        Project.objects.create(title="Mapped Project", description="Desc")
+
+    def test_index_lists_sections(self):
+        response = self.client.get(reverse("sitemap"))
+        self.assertEqual(response["Content-Type"], "application/xml")
+        for section in ["posts", "tags", "projects"]:
+            self.assertContains(response, f"/sitemap-{section}-1.xml</loc>")
+
+    def test_section_pages(self):
+        """Test that pages list published content with lastmod"""
+        url = reverse("sitemap_section", args=["posts", 1])
+        response = self.client.get(url)
+        self.assertContains(response, "http://testserver/blog/mapped-post/")
+        self.assertContains(response, "<lastmod>")
+        self.assertNotContains(response, "/blog/draft/")
+
+        url = reverse("sitemap_section", args=["projects", 1])
+        self.assertContains(self.client.get(url), "/projects/mapped-project/")
+
+        url = reverse("sitemap_section", args=["tags", 1])
+        self.assertContains(self.client.get(url), "/blog/tags/django/feed/atom/")
+
+    def test_unknown_section_and_page_404(self):
+        url = reverse("sitemap_section", args=["users", 1])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse("sitemap_section", args=["posts", 2])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_gzip_variants(self):
+        import gzip
+
+        response = self.client.get(reverse("sitemap_gz"))
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(b"/sitemap-posts-1.xml.gz<", gzip.decompress(response.content))
+
+        url = reverse("sitemap_section_gz", args=["posts", 1])
+        content = gzip.decompress(self.client.get(url).content)
+        self.assertIn(b"/blog/mapped-post/", content)
+
+    def test_pages_cached_until_content_changes(self):
+        """Test that repeat crawls skip the database and edits rebuild pages"""
+        url = reverse("sitemap_section", args=["posts", 1])
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.slug = "renamed-post"
+            self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "/blog/renamed-post/")
+
+    def test_robots_txt_points_to_sitemap(self):
+        response = self.client.get("/robots.txt")
+        self.assertEqual(response["Content-Type"], "text/plain")
+        self.assertContains(response, "Sitemap: http://testserver/sitemap.xml")
+        self.assertContains(response, "Disallow: /admin/")
 
 
 class TemplateRenderingTests(TestCase):
@@ -235,12 +695,55 @@ class TemplateRenderingTests(TestCase):
         self.assertContains(response, "<footer")
         self.assertContains(response, "My Site")
 
+    def built_assets(self):
+        """Point the static files finders at a directory holding the built
+        assets"""
+        import tempfile
+        from pathlib import Path
+
+        source = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (source / "dist").mkdir()
+        (source / "dist" / "site.css").write_text("body{margin:0}")
+        (source / "dist" / "htmx.min.js").write_text("/* htmx */")
+        self.enterContext(override_settings(STATICFILES_DIRS=[source]))
+
     def test_static_file_references(self):
         """Test that static file references are correct"""
+        from django.core.cache import cache
+
+        cache.clear()
+        self.built_assets()
         response = self.client.get(reverse("home"))
-        self.assertContains(response, "/static/site.css")
-        self.assertContains(response, "htmx.org")
-        self.assertContains(response, "tailwindcss.com")
+        self.assertContains(response, "/static/dist/site.css")
+        self.assertContains(response, "/static/dist/htmx.min.js")
+        # Both are built ahead of time and served from our origin
+        self.assertNotContains(response, "cdn.tailwindcss.com")
+        self.assertNotContains(response, "unpkg.com")
+
+    def test_cdn_fallback_until_assets_built(self):
+        """Unbuilt assets fall back to the CDN instead of failing to render"""
+        import tempfile
+
+        from django.core.cache import cache
+
+        cache.clear()
+        storages = {
+            "staticfiles": {
+                "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+            }
+        }
+        with (
+            tempfile.TemporaryDirectory() as source,
+            tempfile.TemporaryDirectory() as root,
+            override_settings(
+                STATICFILES_DIRS=[source], STATIC_ROOT=root, STORAGES=storages
+            ),
+        ):
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "cdn.tailwindcss.com")
+        self.assertContains(response, "unpkg.com/htmx.org@")
+        self.assertNotContains(response, "/static/dist/")
 
     def test_navigation_links(self):
         """Test that navigation links are present and correct"""
@@ -280,6 +783,37 @@ class StaticFilesTests(TestCase):
                 except Exception as e:
                     self.fail(f"collectstatic failed: {e}")
 
+    def test_fingerprinted_assets_cached_forever(self):
+        import tempfile
+        from pathlib import Path
+
+        from django.core.management import call_command
+        from django.templatetags.static import static
+
+        with (
+            tempfile.TemporaryDirectory() as source,
+            tempfile.TemporaryDirectory() as root,
+        ):
+            (Path(source) / "dist").mkdir()
+            (Path(source) / "dist" / "site.css").write_text("body{margin:0}")
+            storages = {
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage."
+                    "ManifestStaticFilesStorage"
+                }
+            }
+            with override_settings(
+                STATICFILES_DIRS=[source], STATIC_ROOT=root, STORAGES=storages
+            ):
+                call_command("collectstatic", "--noinput", verbosity=0)
+                url = static("dist/site.css")
+                self.assertRegex(url, r"^/static/dist/site\.[0-9a-f]{12}\.css$")
+
+                response = Client().get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("immutable", response["Cache-Control"])
+                self.assertIn("max-age=315360000", response["Cache-Control"])
+
 
 class UrlPatternsTests(TestCase):
     def test_url_patterns_resolve(self):
@@ -16,6 +16,33 @@ urlpatterns = [
     path("projects/", views.projects, name="projects"),
     path("projects/<slug:slug>/", views.project_detail, name="project_detail"),
     path("blog/", views.blog_index, name="blog_index"),
+    path("blog/search/", views.blog_search, name="blog_search"),
+    path("blog/feed/<str:fmt>/", views.blog_feed, name="blog_feed"),
+    path(
+        "blog/tags/<slug:slug>/feed/<str:fmt>/",
+        views.blog_tag_feed,
+        name="blog_tag_feed",
+    ),
     path("blog/<slug:slug>/", views.blog_detail, name="blog_detail"),
     path("contact/", views.contact, name="contact"),
+    # Crawlers
+    path("robots.txt", views.robots_txt, name="robots_txt"),
+    path("sitemap.xml", views.sitemap_index, name="sitemap"),
+    path(
+        "sitemap.xml.gz",
+        views.sitemap_index,
+        {"compressed": True},
+        name="sitemap_gz",
+    ),
+    path(
+        "sitemap-<str:section>-<int:page>.xml",
+        views.sitemap_section,
+        name="sitemap_section",
+    ),
+    path(
+        "sitemap-<str:section>-<int:page>.xml.gz",
+        views.sitemap_section,
+        {"compressed": True},
+        name="sitemap_section_gz",
+    ),
 ]
@@ -1,60 +1,176 @@
+import gzip
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.http import HttpResponseRedirect
-from django.shortcuts import get_object_or_404, render
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.shortcuts import aget_object_or_404, render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.vary import vary_on_headers
 
+from apps.core.conditional import collection_etag, conditional, object_validators
+from apps.core.db_router import replica_reads
+from apps.core.page_cache import cache_page_on
+from apps.core.pagination import InvalidCursor, apaginate_keyset
 from apps.core.tasks import send_contact_email
+from blog.feeds import feed_response
 from blog.models import Post
+from blog.search import highlight, search_posts
 from portfolio.models import Project
 
+from . import sitemaps
+
+_published_posts_etag = collection_etag(Post.objects.published(), versions=["posts"])
+_projects_etag = collection_etag(Project.objects.all(), versions=["projects"])
+_home_etag = collection_etag(
+    Post.objects.published(), Project.objects.all(), versions=["posts", "projects"]
+)
+_post_etag, _post_last_modified = object_validators(
+    Post.objects.published(), "slug", versions=[lambda slug: f"post:{slug}", "tags"]
+)
+_project_etag, _project_last_modified = object_validators(Project.objects.all(), "slug")
+
+
+# Templates render in a thread: context processors and templates read the
+# session, user and messages, which may query the database.
+arender = sync_to_async(render)
 
-def home(request):
-    latest_posts = Post.objects.filter(published=True).order_by("-created_at")[:3]
+
+@replica_reads
+@cache_page_on("posts", "projects")
+@conditional(etag_func=_home_etag)
+async def home(request):
+    latest_posts = Post.objects.published().for_listing().order_by("-created_at")[:3]
     latest_projects = Project.objects.order_by("-id")[:6]
 
     context = {
-        "latest_posts": latest_posts,
-        "latest_projects": latest_projects,
+        "latest_posts": [post async for post in latest_posts],
+        "latest_projects": [project async for project in latest_projects],
     }
-    return render(request, "home.html", context)
+    return await arender(request, "home.html", context)
 
 
-def about(request):
-    return render(request, "about.html")
+async def about(request):
+    return await arender(request, "about.html")
 
 
-def projects(request):
+@replica_reads
+@cache_page_on("projects")
+@conditional(etag_func=_projects_etag)
+async def projects(request):
     projects_list = Project.objects.order_by("-id")
-    context = {"projects": projects_list}
-    return render(request, "projects.html", context)
+    context = {"projects": [project async for project in projects_list]}
+    return await arender(request, "projects.html", context)
 
 
-def project_detail(request, slug):
-    project = get_object_or_404(Project, slug=slug)
+@replica_reads
+@cache_page_on(lambda slug: f"project:{slug}")
+@conditional(etag_func=_project_etag, last_modified_func=_project_last_modified)
+async def project_detail(request, slug):
+    project = await aget_object_or_404(Project, slug=slug)
     context = {"project": project}
-    return render(request, "projects/detail.html", context)
-
+    return await arender(request, "projects/detail.html", context)
 
-def blog_index(request):
-    posts_list = Post.objects.filter(published=True).order_by("-created_at")
-    paginator = Paginator(posts_list, 10)
 
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+@replica_reads
+@vary_on_headers("HX-Request")
+@cache_page_on("posts")
+@conditional(etag_func=_published_posts_etag)
+async def blog_index(request):
+    posts_list = Post.objects.published().for_listing()
+    try:
+        page_obj = await apaginate_keyset(posts_list, request.GET.get("cursor"), 10)
+    except InvalidCursor:
+        raise Http404("Invalid cursor")
 
     # If HTMX request, return only the posts partial
     if request.headers.get("HX-Request"):
-        return render(request, "blog/_posts.html", {"page_obj": page_obj})
+        return await arender(request, "blog/_posts.html", {"page_obj": page_obj})
 
     context = {"page_obj": page_obj}
-    return render(request, "blog/index.html", context)
-
-
-def blog_detail(request, slug):
-    post = get_object_or_404(Post, slug=slug, published=True)
-    context = {"post": post}
-    return render(request, "blog/detail.html", context)
+    return await arender(request, "blog/index.html", context)
+
+
+@replica_reads
+@cache_page_on(lambda slug: f"post:{slug}", "tags")
+@conditional(etag_func=_post_etag, last_modified_func=_post_last_modified)
+async def blog_detail(request, slug):
+    post = await aget_object_or_404(
+        Post.objects.with_related(), slug=slug, published=True
+    )
+    context = {"post": post, "related_posts": await post.arelated_posts()}
+    return await arender(request, "blog/detail.html", context)
+
+
+@replica_reads
+@conditional(etag_func=_published_posts_etag)
+async def blog_search(request):
+    query = request.GET.get("q", "").strip()
+    results = search_posts(Post.objects.published().for_listing(), query)
+    paginator = Paginator(results, 10)
+    paginator.count = await results.acount()
+    page_obj = paginator.get_page(request.GET.get("page", 1))
+    page_obj.object_list = [post async for post in page_obj.object_list]
+
+    for post in page_obj:
+        post.snippet = highlight(post.headline)
+
+    context = {"query": query, "page_obj": page_obj}
+    return await arender(request, "blog/search.html", context)
+
+
+@replica_reads
+def blog_feed(request, fmt):
+    return feed_response(request, fmt)
+
+
+@replica_reads
+def blog_tag_feed(request, slug, fmt):
+    return feed_response(request, fmt, tag_slug=slug)
+
+
+def _sitemap_response(request, content, etag, compressed):
+    etag = f'"{etag}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if compressed:
+            response = HttpResponse(content, content_type="application/gzip")
+        else:
+            response = HttpResponse(
+                gzip.decompress(content), content_type="application/xml"
+            )
+        response["ETag"] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+@replica_reads
+def sitemap_index(request, compressed=False):
+    base_url = request.build_absolute_uri("/").rstrip("/")
+    content, etag = sitemaps.sitemap_index(base_url, compressed)
+    return _sitemap_response(request, content, etag, compressed)
+
+
+@replica_reads
+def sitemap_section(request, section, page, compressed=False):
+    base_url = request.build_absolute_uri("/").rstrip("/")
+    content, etag = sitemaps.sitemap_page(base_url, section, page)
+    return _sitemap_response(request, content, etag, compressed)
+
+
+def robots_txt(request):
+    lines = [
+        "User-agent: *",
+        "Disallow: /admin/",
+        "Disallow: /accounts/",
+        "Disallow: /dashboard/",
+        "Disallow: /api/",
+        "Disallow: /blog/search/",
+        "",
+        f"Sitemap: {request.build_absolute_uri(reverse('sitemap'))}",
+    ]
+    return HttpResponse("\n".join(lines) + "\n", content_type="text/plain")
 
 
 def contact(request):
@@ -0,0 +1,24 @@
+from apps.core.hot_queries import register
+
+from .models import Project
+
+
+@register("portfolio.home_latest")
+def home_latest():
+    return Project.objects.order_by("-id")[:6]
+
+
+@register("portfolio.api_listing")
+def api_listing():
+    return Project.objects.order_by("-created_at", "-id")[:20]
+
+
+@register("portfolio.featured_listing")
+def featured_listing():
+    return Project.objects.filter(featured=True).order_by("-created_at", "-id")[:20]
+
+
+@register("portfolio.detail")
+def detail():
+    slug = Project.objects.values_list("slug", flat=True).first() or ""
+    return Project.objects.filter(slug=slug)
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0004_project_github_link"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="portfolio_project_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("featured", True)),
+                fields=["-created_at", "-id"],
+                name="portfolio_project_featured_idx",
+            ),
+        ),
+    ]
@@ -25,3 +25,14 @@ class Project(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Cursor-paginated API listing, optionally filtered to featured
+            models.Index(
+                fields=["-created_at", "-id"], name="portfolio_project_created_idx"
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(featured=True),
+                name="portfolio_project_featured_idx",
+            ),
+        ]
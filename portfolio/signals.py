@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.page_cache import invalidate_on_commit
+
+from .models import Project
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_slug(sender, instance, **kwargs):
+    """Keep the stored slug so a renamed project also drops its old page"""
+    instance._previous_slug = (
+        Project.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_pages(sender, instance, **kwargs):
+    slugs = {instance.slug, getattr(instance, "_previous_slug", None)}
+    invalidate_on_commit("projects", *(f"project:{slug}" for slug in slugs if slug))
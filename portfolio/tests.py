@@ -37,3 +37,27 @@ class PortfolioAPITest(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["title"], "Test Project")
+
+    def test_get_projects_conditional(self):
+        url = "/api/portfolio/projects/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.project.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleting_older_project_changes_etag(self):
+        older = Project.objects.create(title="Older", description="Desc")
+        Project.objects.filter(pk=older.pk).update(updated_at=self.project.updated_at)
+        url = "/api/portfolio/projects/"
+        etag = self.client.get(url)["ETag"]
+
+        # The newest updated_at is unchanged; the "projects" version is not
+        with self.captureOnCommitCallbacks(execute=True):
+            older.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -2,20 +2,29 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
 from rest_framework.filters import OrderingFilter, SearchFilter
 
+from apps.core.conditional import collection_etag, conditional_api, object_validators
+from apps.core.pagination import CreatedAtCursorPagination
+
 from .models import Project
 from .serializers import ProjectSerializer
 
+_projects_etag = collection_etag(Project.objects.all(), versions=["projects"])
+_project_etag, _project_last_modified = object_validators(Project.objects.all(), "pk")
+
 
+@conditional_api(etag_func=_projects_etag)
 class ProjectListView(generics.ListAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    pagination_class = CreatedAtCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["featured"]
     search_fields = ["title", "description"]
     ordering_fields = ["created_at", "updated_at"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]
 
 
+@conditional_api(etag_func=_project_etag, last_modified_func=_project_last_modified)
 class ProjectDetailView(generics.RetrieveAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
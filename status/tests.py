@@ -1,11 +1,19 @@
+import asyncio
 import json
+from unittest.mock import patch
 
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from .checks import check_database, readiness
+
 
 class StatusViewTest(APITestCase):
+    def setUp(self):
+        readiness.reset()
+
     def test_healthz_endpoint(self):
         url = reverse("healthz")
         response = self.client.get(url)
@@ -15,3 +23,85 @@ class StatusViewTest(APITestCase):
         response_data = json.loads(response.content)
         self.assertIn("status", response_data)
         self.assertIn("checks", response_data)
+
+    def test_livez_checks_nothing(self):
+        with patch("status.checks.run_checks") as run_checks:
+            response = self.client.get(reverse("livez"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"status": "alive"})
+        run_checks.assert_not_called()
+
+    async def test_readyz_reports_each_dependency(self):
+        response = await self.async_client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("no-cache", response["Cache-Control"])
+        data = json.loads(response.content)
+        self.assertEqual(data["status"], "ready")
+        self.assertEqual(set(data["checks"]), {"database", "redis", "broker"})
+        for result in data["checks"].values():
+            self.assertEqual(result["status"], "ok")
+            self.assertGreaterEqual(result["latency_ms"], 0)
+
+    def test_readyz_does_not_write_to_cache(self):
+        with (
+            patch("status.checks.cache.aset") as aset,
+            patch("status.checks.cache.set") as cache_set,
+        ):
+            self.client.get(reverse("readyz"))
+        aset.assert_not_called()
+        cache_set.assert_not_called()
+
+    def test_readyz_reports_failure(self):
+        with patch("status.checks.cache.aget", side_effect=ConnectionError("down")):
+            response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        data = json.loads(response.content)
+        self.assertEqual(data["status"], "unavailable")
+        self.assertEqual(data["checks"]["database"]["status"], "ok")
+        self.assertEqual(data["checks"]["redis"]["status"], "error")
+        self.assertEqual(data["checks"]["redis"]["error"], "down")
+
+    @override_settings(HEALTH_CHECK_TIMEOUT=0.05)
+    def test_readyz_times_out_slow_dependency(self):
+        async def hang(key):
+            await asyncio.sleep(1)
+
+        with patch("status.checks.cache.aget", hang):
+            response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        redis = json.loads(response.content)["checks"]["redis"]
+        self.assertEqual(redis["status"], "timeout")
+        self.assertLess(redis["latency_ms"], 1000)
+
+    def test_readyz_result_is_reused_briefly(self):
+        first = json.loads(self.client.get(reverse("readyz")).content)
+        with patch("status.checks.run_checks") as run_checks:
+            second = json.loads(self.client.get(reverse("readyz")).content)
+        run_checks.assert_not_called()
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["checks"], second["checks"])
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=0)
+    def test_readyz_rechecks_after_window(self):
+        self.client.get(reverse("readyz"))
+        data = json.loads(self.client.get(reverse("readyz")).content)
+        self.assertFalse(data["cached"])
+
+    async def test_concurrent_probes_share_one_check(self):
+        calls = []
+
+        async def slow_checks():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"status": "ready", "checks": {}}
+
+        with patch("status.checks.run_checks", slow_checks):
+            results = await asyncio.gather(*(readiness.check() for _ in range(5)))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(report["status"] == "ready" for report, _ in results))
+
+    def test_database_check_closes_its_connection(self):
+        with patch("status.checks.connections") as connections:
+            check_database()
+        connections["default"].close.assert_called_once_with()
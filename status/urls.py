@@ -1,8 +1,11 @@
 from django.urls import include, path
 
-from .views import healthz
+from .views import livez, readyz
 
 urlpatterns = [
-    path("healthz/", healthz, name="healthz"),
+    path("livez/", livez, name="livez"),
+    path("readyz/", readyz, name="readyz"),
+    # Kept for existing monitors; same as readyz
+    path("healthz/", readyz, name="healthz"),
     path("metrics/", include("django_prometheus.urls")),
 ]
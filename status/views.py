@@ -1,45 +1,31 @@
 import logging
 
-from django.core.cache import cache
-from django.db import connection
 from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
 
-logger = logging.getLogger(__name__)
-
-
-def healthz(request):
-    """Health check endpoint - returns 200 only if DB and Redis are reachable"""
-    status = {"status": "healthy", "checks": {}}
-    is_healthy = True
+from .checks import readiness
 
-    # Check database
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        status["checks"]["database"] = "ok"
-        logger.debug("Database health check passed")
-    except Exception as e:
-        status["checks"]["database"] = f"error: {str(e)}"
-        is_healthy = False
-        logger.error(f"Database health check failed: {str(e)}")
-
-    # Check Redis
-    try:
-        cache.set("health_check", "ok", 60)
-        if cache.get("health_check") == "ok":
-            status["checks"]["redis"] = "ok"
-            logger.debug("Redis health check passed")
-        else:
-            status["checks"]["redis"] = "error: cache test failed"
-            is_healthy = False
-            logger.error("Redis health check failed: cache test failed")
-    except Exception as e:
-        status["checks"]["redis"] = f"error: {str(e)}"
-        is_healthy = False
-        logger.error(f"Redis health check failed: {str(e)}")
+logger = logging.getLogger(__name__)
 
-    if not is_healthy:
-        status["status"] = "unhealthy"
 
-    response_status = 200 if is_healthy else 503
-    return JsonResponse(status, status=response_status)
+@never_cache
+async def livez(request):
+    """Liveness probe: the process is up and serving requests. Checks no
+    dependencies, so an outage elsewhere never gets the container restarted."""
+    return JsonResponse({"status": "alive"})
+
+
+@never_cache
+async def readyz(request):
+    """Readiness probe: 200 only if Postgres, Redis and the Celery broker all
+    answered within the timeout, with each one's status and latency."""
+    report, cached = await readiness.check()
+    if not cached and report["status"] != "ready":
+        failed = {
+            name: result
+            for name, result in report["checks"].items()
+            if result["status"] != "ok"
+        }
+        logger.error(f"Readiness check failed: {failed}")
+    response_status = 200 if report["status"] == "ready" else 503
+    return JsonResponse({**report, "cached": cached}, status=response_status)
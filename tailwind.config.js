@@ -0,0 +1,10 @@
+/** Tailwind configuration for `python manage.py build_assets`.
+ * Classes are only generated for what these files use, so build the
+ * stylesheet again after changing the markup. */
+module.exports = {
+  content: ["./templates/**/*.html"],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};